@@ -1,11 +1,29 @@
-from flask import Flask, render_template
-from tools.onefill.routes import onefill_bp
-from tools.text_detector.routes import textdetector_bp
+from flask import Flask, render_template, jsonify
+from tools.startup import phase, startup_report, ensure_chromium, preload_in_background, import_profile, TOOL_MODULES
+from tools.uploads import MAX_REQUEST_BYTES
+import os
+with phase("import_onefill"):
+    from tools.onefill.routes import onefill_bp
+with phase("import_text_detector"):
+    from tools.text_detector.routes import textdetector_bp
+with phase("import_api"):
+    from tools.api.routes import api_bp
 import threading, webbrowser
+import click
 from flask import redirect
 app = Flask(__name__)
-app.register_blueprint(onefill_bp, url_prefix="/onefill")
-app.register_blueprint(textdetector_bp, url_prefix="/text-detector")
+# Oversized request bodies are refused with 413 before any view reads them.
+app.config["MAX_CONTENT_LENGTH"] = MAX_REQUEST_BYTES
+with phase("register_blueprints"):
+    app.register_blueprint(onefill_bp, url_prefix="/onefill")
+    app.register_blueprint(textdetector_bp, url_prefix="/text-detector")
+    app.register_blueprint(api_bp, url_prefix="/api/v1")
+
+@app.before_request
+def start_preload():
+    # The first request proves the server is listening; warm heavy imports behind it.
+    if os.environ.get("OMNIAI_PRELOAD", "1") == "1":
+        preload_in_background()
 
 @app.route("/")
 def dashboard():
@@ -13,9 +31,48 @@ def dashboard():
 
 @app.route("/ats")
 def ats_portal():
-    from tools.ats_portal.ats_app import launch_ats
-    threading.Thread(target=launch_ats, daemon=True).start()
-    return redirect("http://127.0.0.1:7861")
+    from tools.ats_portal.server import get_ats_server, ATS_PUBLIC_URL
+    if not get_ats_server().ensure_running():
+        return "ATS portal is unavailable right now, please retry shortly.", 503
+    return redirect(ATS_PUBLIC_URL)
+
+@app.route("/health/ats")
+def ats_health():
+    from tools.ats_portal.server import get_ats_server
+    status = get_ats_server().status()
+    return jsonify(status), (200 if status["healthy"] else 503)
+
+@app.route("/health/startup")
+def startup_health():
+    return jsonify(startup_report())
+
+@app.route("/health/extract-cache")
+def extract_cache_health():
+    from tools.extract_cache import get_extract_cache
+    return jsonify(get_extract_cache().stats())
+
+# Import profiling spawns an interpreter per tool, so it is a CLI command
+# only, never an HTTP endpoint.
+@app.cli.command("import-profile")
+@click.argument("tool", required=False, type=click.Choice(list(TOOL_MODULES)))
+def import_profile_command(tool):
+    """Print the -X importtime report for one tool, or all of them."""
+    for tool in [tool] if tool else TOOL_MODULES:
+        report = import_profile(tool, refresh=True)
+        print(f"{tool}: {report['total_ms']} ms" + ("" if report["ok"] else f" (failed: {report['error']})"))
+        for pkg, ms in report["by_package_ms"].items():
+            print(f"    {pkg:<24} {ms:>8} ms")
+
+@app.cli.command("warmup")
+def warmup():
+    """Provision Playwright Chromium and verify it launches."""
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        if not ensure_chromium(p, auto_install=True):
+            raise SystemExit("❌ Chromium could not be installed.")
+        with phase("chromium_launch"):
+            p.chromium.launch(headless=True, args=["--no-sandbox"]).close()
+    print(f"✅ Warmup complete: {startup_report()['phases_ms']}")
 
 if __name__ == "__main__":
     threading.Timer(1, lambda: webbrowser.open("http://127.0.0.1:5000")).start()
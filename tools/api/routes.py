@@ -0,0 +1,222 @@
+# tools/api/routes.py
+"""
+Versioned JSON API for the text detector and the ATS analyzer, mounted at
+/api/v1 so other services can call them without scraping the HTML pages.
+
+Both endpoints take raw text (JSON or form fields) and/or files (.zip
+archives are expanded), many items per request. Extraction and scoring run
+in the process pool from `tools.api.workers`; results come back in request
+order with timings.
+
+    POST /api/v1/detect     {"texts": ["...", {"id": "a", "text": "..."}]}
+    POST /api/v1/ats/score  {"job": "...", "resumes": ["...", ...]}
+"""
+
+import os
+import time
+import zipfile
+
+from flask import Blueprint, jsonify, request
+
+from tools.uploads import open_upload, iter_uploads, UploadTooLarge
+from tools.text_detector.routes import extract_text, score_category, SUPPORTED as DETECT_SUPPORTED
+from tools.api import workers
+
+api_bp = Blueprint("api", __name__)
+
+MAX_ITEMS = int(os.environ.get("OMNIAI_API_MAX_ITEMS", "5000"))
+
+
+class _BadRequest(ValueError):
+    pass
+
+
+@api_bp.errorhandler(_BadRequest)
+def _bad_request(e):
+    return jsonify({"error": str(e)}), 400
+
+
+@api_bp.errorhandler(UploadTooLarge)
+def _too_large(e):
+    return jsonify({"error": str(e)}), 413
+
+
+@api_bp.errorhandler(zipfile.BadZipFile)
+def _bad_zip(e):
+    return jsonify({"error": f"Invalid .zip archive: {e}"}), 400
+
+
+# -------------------------
+# Request parsing
+# -------------------------
+def _payload():
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return {}
+    if not isinstance(payload, dict):
+        raise _BadRequest("The JSON body must be an object.")
+    return payload
+
+
+def _text_items(payload, field, single):
+    """
+    (id, text) pairs from a JSON list field (strings or {"id", "text"}), a
+    single JSON string and repeated form fields; ids default to the position.
+    """
+    raw = payload.get(field) or []
+    if not isinstance(raw, list):
+        raise _BadRequest(f"'{field}' must be a list.")
+    if isinstance(payload.get(single), str):
+        raw = raw + [payload[single]]
+    raw = raw + request.form.getlist(field) + request.form.getlist(single)
+
+    items = []
+    for i, entry in enumerate(raw):
+        if isinstance(entry, str):
+            items.append((i, entry))
+        elif isinstance(entry, dict) and isinstance(entry.get("text"), str):
+            items.append((entry.get("id", i), entry["text"]))
+        else:
+            raise _BadRequest(f"'{field}' entries must be strings or objects with a 'text' string.")
+    if len(items) > MAX_ITEMS:
+        raise _BadRequest(f"At most {MAX_ITEMS} items per request.")
+    return items
+
+
+def _file_items(field, single, supported, room):
+    """(filename, bytes) for each uploaded file and supported .zip member."""
+    files = request.files.getlist(field) + request.files.getlist(single)
+    try:
+        for name, doc in iter_uploads(files, supported, max(room, 0)):
+            yield name, doc.read()
+    except UploadTooLarge:
+        raise
+    except ValueError as e:
+        raise _BadRequest(str(e))
+
+
+def _tasks(texts, files, text_fn, file_fn, *extra):
+    """
+    Pool tasks keyed by result slots: raw texts first, grouped into chunks
+    of about TASK_CHARS, then one task per file.
+    """
+    for chunk in workers.text_chunks(enumerate(t for _, t in texts)):
+        yield [i for i, _ in chunk], text_fn, ([t for _, t in chunk], *extra)
+    for n, (name, data) in enumerate(files, len(texts)):
+        yield [n], file_fn, (name, data, *extra)
+
+
+def _run(texts, files, text_fn, file_fn, *extra):
+    """Per-item result dicts in request order, plus summed worker time in ms."""
+    results, worker_ms = {}, 0.0
+    for slots, rows, ms in workers.run_tasks(_tasks(texts, files, text_fn, file_fn, *extra)):
+        results.update(zip(slots, rows))
+        worker_ms += ms
+    return [results[i] for i in range(len(results))], worker_ms
+
+
+def _results(texts, names, rows):
+    """Rows tagged with their id; file rows also carry the filename (== id)."""
+    for n, row in enumerate(rows):
+        if n < len(texts):
+            yield {"id": texts[n][0], **row}
+        else:
+            name = names[n - len(texts)]
+            yield {"id": name, "filename": name, **row}
+
+
+def _job_text(payload):
+    upload = request.files.get("job_file")
+    if not (upload and upload.filename):
+        return payload.get("job") or request.form.get("job", "")
+    if not upload.filename.lower().endswith(DETECT_SUPPORTED):
+        raise _BadRequest("The job description must be a .txt, .docx or .pdf file.")
+    with open_upload(upload.stream, upload.filename) as doc:
+        return extract_text(doc, upload.filename)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+# -------------------------
+# Endpoints
+# -------------------------
+@api_bp.route("/detect", methods=["POST"])
+def detect():
+    """AI-likelihood score per text/file. Texts: "texts"/"text"; files: "files"/"file"."""
+    started = time.perf_counter()
+    texts = _text_items(_payload(), "texts", "text")
+    names = []
+
+    def files():
+        for name, data in _file_items("files", "file", DETECT_SUPPORTED, MAX_ITEMS - len(texts)):
+            names.append(name)
+            yield name, data
+
+    rows, worker_ms = _run(texts, files(), workers.detect_texts, workers.detect_file)
+    if not rows:
+        raise _BadRequest("Send 'texts' (JSON or form) or .txt/.docx/.pdf/.zip uploads as 'files'.")
+
+    results = list(_results(texts, names, rows))
+    for row in results:
+        row["label"], row["explanation"] = score_category(row["score"])
+
+    return jsonify({
+        "count": len(results),
+        "results": results,
+        "timings_ms": {"workers": round(worker_ms, 1), "total": _ms(time.perf_counter() - started)},
+    })
+
+
+@api_bp.route("/ats/score", methods=["POST"])
+def ats_score():
+    """
+    Score resumes against one job description. Job: "job" text or a
+    "job_file" upload; resumes: "resumes"/"resume" texts or .pdf/.docx/.zip
+    uploads under the same names.
+    """
+    # Deferred like the other blueprints' heavy imports: scikit-learn and
+    # NumPy load on the first ATS call, not at app startup.
+    from tools.ats_portal.analysis import calculate_ats_scores
+    from tools.ats_portal.bulk_rank import SUPPORTED as ATS_SUPPORTED
+
+    started = time.perf_counter()
+    payload = _payload()
+    job_text = _job_text(payload)
+    if not isinstance(job_text, str) or not job_text.strip():
+        raise _BadRequest("A job description is required as 'job' or 'job_file'.")
+
+    texts = _text_items(payload, "resumes", "resume")
+    names = []
+
+    def files():
+        for name, data in _file_items("resumes", "resume", ATS_SUPPORTED, MAX_ITEMS - len(texts)):
+            names.append(name)
+            yield name, data
+
+    rows, worker_ms = _run(texts, files(), workers.ats_texts, workers.ats_file, job_text)
+    if not rows:
+        raise _BadRequest("Send resumes as 'resumes' (texts) or .pdf/.docx/.zip uploads.")
+    analyzed = time.perf_counter()
+
+    # One sparse product for the whole batch, in this process so the shared
+    # IDF statistics keep learning from API traffic like the portal's.
+    scores = calculate_ats_scores([row.pop("cleaned") for row in rows], job_text)
+    scored = time.perf_counter()
+
+    for row, score in zip(rows, scores):
+        row["ats_score"] = score
+    results = list(_results(texts, names, rows))
+
+    return jsonify({
+        "count": len(results),
+        "results": results,
+        "timings_ms": {
+            "analyze": _ms(analyzed - started),
+            "workers": round(worker_ms, 1),
+            "score": _ms(scored - analyzed),
+            "total": _ms(time.perf_counter() - started),
+        },
+    })
+
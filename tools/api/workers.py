@@ -0,0 +1,163 @@
+# tools/api/workers.py
+"""
+Process-pool side of the JSON API.
+
+Document extraction and the pure-Python parts of scoring are CPU-bound, so
+API work runs in one shared process pool (tools.procpool) instead of on
+request threads. Tasks take and return plain str/bytes/dicts so they pickle
+cheaply, and every task returns one result dict per item so the routes can
+scatter results back into request order. `run_tasks` keeps only a window of tasks in
+flight, so a large batch never holds every upload in memory at once.
+Scoring modules (NumPy, scikit-learn) are imported inside the tasks, so
+registering the API costs nothing at app startup.
+"""
+
+import io
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+
+from tools.procpool import process_pool
+
+API_WORKERS = int(os.environ.get("OMNIAI_API_WORKERS", str(os.cpu_count() or 1)))
+TASK_CHARS = int(os.environ.get("OMNIAI_API_TASK_CHARS", str(256 * 1024)))  # raw text per pool task
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _worker_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = process_pool(API_WORKERS)
+        return _pool
+
+
+def _discard_pool(pool):
+    # A killed worker breaks the whole executor; the next task gets a fresh one.
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    results = fn(*args)
+    return results, (time.perf_counter() - started) * 1000
+
+
+def _submit(fn, args):
+    """(pool, future) for one task; a broken pool is replaced once."""
+    pool = _worker_pool()
+    try:
+        return pool, pool.submit(_timed, fn, *args)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        pool = _worker_pool()
+        return pool, pool.submit(_timed, fn, *args)
+
+
+def _collect(fn, args, pool, future):
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # The task's worker died; finish it here rather than fail the request.
+        _discard_pool(pool)
+        return _timed(fn, *args)
+
+
+def run_tasks(tasks, workers=API_WORKERS):
+    """
+    Run (key, fn, args) tasks in the pool and yield (key, results, ms) in
+    submission order, with at most 2 * `workers` tasks in flight. `ms` is the
+    time the task took inside its worker.
+    """
+    if workers <= 1:
+        for key, fn, args in tasks:
+            yield (key, *_timed(fn, *args))
+        return
+    pending = deque()
+    try:
+        for key, fn, args in tasks:
+            pending.append((key, fn, args, *_submit(fn, args)))
+            if len(pending) >= workers * 2:
+                key, *job = pending.popleft()
+                yield (key, *_collect(*job))
+        while pending:
+            key, *job = pending.popleft()
+            yield (key, *_collect(*job))
+    finally:
+        for *_, future in pending:
+            future.cancel()
+
+
+def text_chunks(items, size=TASK_CHARS):
+    """Group (index, text) pairs into lists of about `size` characters."""
+    chunk, chars = [], 0
+    for item in items:
+        chunk.append(item)
+        chars += len(item[1])
+        if chars >= size:
+            yield chunk
+            chunk, chars = [], 0
+    if chunk:
+        yield chunk
+
+
+# -------------------------
+# Text detector tasks
+# -------------------------
+def detect_texts(texts):
+    from tools.text_detector.batch import score_texts
+
+    # The pool provides the parallelism; keep each vectorized pass single-threaded.
+    return [{"score": s} for s in score_texts(texts, workers=1)]
+
+
+def detect_file(filename, data):
+    from tools.text_detector.routes import score_file
+
+    try:
+        return [{"score": score_file(io.BytesIO(data), filename)}]
+    except Exception as e:
+        return [{"score": 0.0, "error": str(e)}]
+
+
+# -------------------------
+# ATS tasks
+# -------------------------
+def _ats_result(text, job):
+    from tools.ats_portal.analysis import as_document, find_missing_keywords, suggestions_from_features, text_features
+
+    # Scoring happens in the parent so the shared IDF engine sees every
+    # document; workers return the cleaned text it needs (clean_text is
+    # idempotent, so re-cleaning it there changes nothing).
+    doc = as_document(text)
+    missing = find_missing_keywords(doc, job)
+    return {
+        "cleaned": doc.cleaned,
+        "missing_keywords": missing,
+        "suggestions": suggestions_from_features(text_features(doc), job, missing),
+    }
+
+
+def ats_texts(texts, job_text):
+    from tools.ats_portal.analysis import as_document
+
+    job = as_document(job_text)
+    return [_ats_result(t, job) for t in texts]
+
+
+def ats_file(filename, data, job_text):
+    from tools.ats_portal.analysis import as_document, extract_text_from_pdf, extract_text_from_docx
+
+    extract = extract_text_from_pdf if filename.lower().endswith(".pdf") else extract_text_from_docx
+    text = extract(io.BytesIO(data))
+    result = _ats_result(text, as_document(job_text))
+    result["extracted"] = bool(text)
+    return [result]
@@ -0,0 +1,194 @@
+# tools/ats_portal/analysis.py
+"""
+Resume/job text analysis for the ATS portal: extraction, keywords, scoring
+and suggestions. Kept free of Gradio so batch jobs and worker processes can
+import it cheaply.
+"""
+
+import re, string
+from collections import Counter
+import docx2txt
+from tools.ats_portal.scoring import get_engine
+from tools.extract_cache import cached_extract
+from tools.pdf_extract import extract_pdf_text, pdf_cache_kind
+
+# -------------------------
+# Text utilities
+# -------------------------
+def extract_text_from_pdf(path):
+    try:
+        return cached_extract(path, extract_pdf_text, pdf_cache_kind())
+    except:
+        return ""
+
+def extract_text_from_docx(path):
+    try:
+        return cached_extract(path, lambda p: docx2txt.process(p) or "", "docx:docx2txt")
+    except:
+        return ""
+
+# Compiled once at import; every analysis reuses them.
+_DIGITS = re.compile(r'\d+')
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+STOPWORDS = frozenset([
+    "and","or","the","a","an","of","to","for","in","on","with","by","at","as","from",
+    "is","are","be","this","that","will","can","must","should","we","our","you","your"
+])
+
+def clean_text(text):
+    if not text: return ""
+    return _DIGITS.sub(' ', text.lower()).translate(_PUNCT_TABLE)
+
+class Document:
+    """
+    One resume or job text, lowercased, cleaned and tokenized exactly once.
+    Scoring, keyword extraction and suggestions all read from the same object.
+    """
+    __slots__ = ("raw", "lower", "cleaned", "_keyword_counts")
+
+    def __init__(self, text):
+        self.raw = text or ""
+        self.lower = self.raw.lower()
+        self.cleaned = _DIGITS.sub(' ', self.lower).translate(_PUNCT_TABLE) if self.raw else ""
+        self._keyword_counts = None
+
+    @property
+    def keyword_counts(self):
+        if self._keyword_counts is None:
+            self._keyword_counts = Counter(w for w in self.cleaned.split() if w not in STOPWORDS and len(w) > 1)
+        return self._keyword_counts
+
+    def keywords(self, top_n=30):
+        return [w for w,_ in self.keyword_counts.most_common(top_n)]
+
+def as_document(text):
+    return text if isinstance(text, Document) else Document(text)
+
+def get_keywords(text, top_n=30):
+    return as_document(text).keywords(top_n)
+
+def calculate_ats_score(resume_text, job_text):
+    r, j = as_document(resume_text), as_document(job_text)
+    if not r.raw or not j.raw:
+        return 0.0
+    # The engine's IDF comes from every resume/job seen so far, not just this pair.
+    engine = get_engine()
+    engine.add_documents([r.cleaned, j.cleaned])
+    return round(float(engine.score_one_to_many(r.cleaned, [j.cleaned])[0]), 2)
+
+def calculate_ats_scores(resume_texts, job_text):
+    """Score many resumes against one job with a single sparse matrix product."""
+    j = as_document(job_text)
+    if not j.raw:
+        return [0.0] * len(resume_texts)
+    engine = get_engine()
+    resumes = [as_document(r).cleaned for r in resume_texts]
+    engine.add_documents(resumes + [j.cleaned])
+    scores = engine.score_many_to_one(resumes, j.cleaned)
+    return [round(float(s), 2) if r else 0.0 for r, s in zip(resumes, scores)]
+
+def find_missing_keywords(resume_text, job_text):
+    rkw = set(get_keywords(resume_text, 60))
+    jkw = set(get_keywords(job_text, 60))
+    return sorted(list(jkw - rkw))
+
+# -------------------------
+# Suggestion logic
+# -------------------------
+SECTIONS = ["education","experience","skills","projects","certifications","summary"]
+STRONG_VERBS = ["led","developed","designed","implemented","managed","created","analyzed","optimized"]
+LINK_MARKERS = ["linkedin","github","portfolio"]
+
+def text_features(resume_text):
+    """Section/contact flags and top keyword counts used by the suggestions."""
+    doc = as_document(resume_text)
+    r = doc.lower
+    return {
+        "version": 1,
+        "length": len(doc.raw),
+        "sections": [s for s in SECTIONS if s in r],
+        "has_action_verbs": any(v in r for v in STRONG_VERBS),
+        "has_email": "@" in r,
+        "has_links": any(x in r for x in LINK_MARKERS),
+        "keyword_counts": doc.keyword_counts.most_common(60),
+    }
+
+def build_resume_features(resume_text):
+    """
+    Everything later analyses need from a resume, without the raw text: the
+    text_features flags and keywords plus hashed term counts for scoring
+    (IDF is applied at score time, so the record never goes stale).
+    """
+    doc = as_document(resume_text)
+    features = text_features(doc)
+    engine = get_engine()
+    engine.add_documents([doc.cleaned])
+    features["term_indices"], features["term_counts"] = engine.count_vector(doc.cleaned)
+    return features
+
+def score_from_features(features, job_text):
+    j = as_document(job_text)
+    if not features or not j.raw:
+        return 0.0
+    engine = get_engine()
+    engine.add_documents([j.cleaned])
+    return round(float(engine.score_counts(features["term_indices"], features["term_counts"], [j.cleaned])[0]), 2)
+
+def missing_keywords_from_features(features, job_text):
+    rkw = {w for w, _ in features["keyword_counts"]}
+    jkw = set(get_keywords(job_text, 60))
+    return sorted(list(jkw - rkw))
+
+def suggestions_from_features(features, job_text, missing=None):
+    suggestions = []
+
+    for s in [s for s in SECTIONS if s not in features["sections"]]:
+        suggestions.append(f"Consider adding or improving your '{s.title()}' section.")
+
+    if features["length"] < 450:
+        suggestions.append("Resume appears short — expand on projects, responsibilities, and results.")
+    elif features["length"] > 3500:
+        suggestions.append("Resume appears long — condense to 1–2 pages and focus on relevance.")
+
+    if not features["has_action_verbs"]:
+        suggestions.append("Use action verbs to emphasize impact.")
+
+    if missing is None:
+        missing = missing_keywords_from_features(features, job_text)
+    if missing:
+        suggestions.append("Include keywords such as: " + ", ".join(missing[:8]))
+
+    if not features["has_email"]:
+        suggestions.append("Add a professional email address near the top.")
+
+    if not features["has_links"]:
+        suggestions.append("Add LinkedIn/GitHub/portfolio links.")
+
+    return suggestions or ["Your resume aligns well with the job description."]
+
+def generate_suggestions(resume_text, job_text):
+    return suggestions_from_features(text_features(resume_text), job_text)
+
+# -------------------------
+# Single-pass pipeline
+# -------------------------
+def analyze_pair(resume_text, job_text):
+    """Score, missing keywords and suggestions with each text tokenized once."""
+    r, j = as_document(resume_text), as_document(job_text)
+    missing = find_missing_keywords(r, j)
+    return {
+        "score": calculate_ats_score(r, j),
+        "missing": missing,
+        "suggestions": suggestions_from_features(text_features(r), j, missing),
+    }
+
+def analyze_with_features(features, job_text):
+    """Same as analyze_pair for a stored default resume; only the job is processed."""
+    j = as_document(job_text)
+    missing = missing_keywords_from_features(features, j)
+    return {
+        "score": score_from_features(features, j),
+        "missing": missing,
+        "suggestions": suggestions_from_features(features, j, missing),
+    }
@@ -9,140 +9,48 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 import gradio as gr
-import json, os, re, string, hashlib, binascii
-from collections import Counter
-from PyPDF2 import PdfReader
-import docx2txt
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import tempfile
 from datetime import datetime
+from tools.ats_portal.user_store import get_store
+from tools.uploads import open_upload, UploadTooLarge
+from tools.ats_portal.server import get_ats_server
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_FILE = os.path.join(BASE_DIR, "resume_portal_db.json")
+# Gradio keeps its own copy of every upload; purge copies older than this (seconds).
+UPLOAD_CACHE_TTL = int(os.environ.get("ATS_UPLOAD_CACHE_TTL", "3600"))
 
 # -------------------------
 # Password hashing utilities
 # -------------------------
-def hash_password(password: str, salt: bytes = None):
-    if salt is None:
-        salt = os.urandom(16)
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 200000)
-    return binascii.hexlify(salt).decode(), binascii.hexlify(dk).decode()
-
-def verify_password(stored_salt_hex: str, stored_hash_hex: str, password_attempt: str) -> bool:
-    salt = binascii.unhexlify(stored_salt_hex.encode())
-    attempt_hash = hashlib.pbkdf2_hmac("sha256", password_attempt.encode("utf-8"), salt, 200000)
-    return binascii.hexlify(attempt_hash).decode() == stored_hash_hex
+# PBKDF2 runs in auth's process pool; see auth.py for sessions and rate limits.
+from tools.ats_portal.auth import (
+    hash_password, verify_password, is_rate_limited, record_failure, clear_failures,
+    issue_session, verify_session
+)
 
 # -------------------------
 # DB helpers
 # -------------------------
-def load_db():
-    if not os.path.exists(DB_FILE):
-        with open(DB_FILE, "w") as f:
-            json.dump({}, f)
-    with open(DB_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except:
-            return {}
-
-def save_db(db):
-    with open(DB_FILE, "w") as f:
-        json.dump(db, f, indent=2)
+# Users and history live in SQLite (see user_store.py); the old JSON DB_FILE
+# is imported into it once on first start.
+store = get_store()
 
 def ensure_admin():
-    db = load_db()
-    if "admin" not in db:
+    if store.get_user("admin") is None:
         salt, h = hash_password("adminpass")
-        db["admin"] = {
-            "salt": salt,
-            "pw_hash": h,
-            "default_resume": None,
-            "history": []
-        }
-        save_db(db)
+        store.create_user("admin", salt, h)
 ensure_admin()
 
 # -------------------------
-# Text utilities
+# Text utilities and suggestion logic (see analysis.py)
 # -------------------------
-def extract_text_from_pdf(path):
-    try:
-        reader = PdfReader(path)
-        return " ".join([p.extract_text() or "" for p in reader.pages])
-    except:
-        return ""
-
-def extract_text_from_docx(path):
-    try:
-        return docx2txt.process(path) or ""
-    except:
-        return ""
-
-def clean_text(text):
-    if not text: return ""
-    t = text.lower()
-    t = re.sub(r'\d+', ' ', t)
-    t = t.translate(str.maketrans('', '', string.punctuation))
-    return t
-
-def get_keywords(text, top_n=30):
-    txt = clean_text(text)
-    if not txt: return []
-    stopwords = set([
-        "and","or","the","a","an","of","to","for","in","on","with","by","at","as","from",
-        "is","are","be","this","that","will","can","must","should","we","our","you","your"
-    ])
-    words = [w for w in txt.split() if w not in stopwords and len(w) > 1]
-    freq = Counter(words)
-    return [w for w,_ in freq.most_common(top_n)]
-
-def calculate_ats_score(resume_text, job_text):
-    if not resume_text or not job_text:
-        return 0.0
-    vectorizer = TfidfVectorizer()
-    tfidf = vectorizer.fit_transform([clean_text(resume_text), clean_text(job_text)])
-    sim = cosine_similarity(tfidf[0:1], tfidf[1:2])[0,0]
-    return round(sim * 100, 2)
-
-def find_missing_keywords(resume_text, job_text):
-    rkw = set(get_keywords(resume_text, 60))
-    jkw = set(get_keywords(job_text, 60))
-    return sorted(list(jkw - rkw))
-
-# -------------------------
-# Suggestion logic
-# -------------------------
-def generate_suggestions(resume_text, job_text):
-    suggestions = []
-    r = (resume_text or "").lower()
-    j = (job_text or "").lower()
-
-    sections = ["education","experience","skills","projects","certifications","summary"]
-    for s in [s for s in sections if s not in r]:
-        suggestions.append(f"Consider adding or improving your '{s.title()}' section.")
-
-    if len(resume_text or "") < 450:
-        suggestions.append("Resume appears short — expand on projects, responsibilities, and results.")
-    elif len(resume_text or "") > 3500:
-        suggestions.append("Resume appears long — condense to 1–2 pages and focus on relevance.")
-
-    strong_verbs = ["led","developed","designed","implemented","managed","created","analyzed","optimized"]
-    if not any(v in r for v in strong_verbs):
-        suggestions.append("Use action verbs to emphasize impact.")
-
-    missing = find_missing_keywords(resume_text, job_text)
-    if missing:
-        suggestions.append("Include keywords such as: " + ", ".join(missing[:8]))
-
-    if "@" not in r:
-        suggestions.append("Add a professional email address near the top.")
-
-    if not any(x in r for x in ["linkedin","github","portfolio"]):
-        suggestions.append("Add LinkedIn/GitHub/portfolio links.")
-
-    return suggestions or ["Your resume aligns well with the job description."]
+from tools.ats_portal.analysis import (
+    extract_text_from_pdf, extract_text_from_docx, clean_text, get_keywords,
+    calculate_ats_score, find_missing_keywords, generate_suggestions,
+    build_resume_features, analyze_pair, analyze_with_features
+)
+from tools.ats_portal.bulk_rank import rank_resumes, write_csv
 
 # -------------------------
 # Auth and logic
@@ -150,66 +58,95 @@ def generate_suggestions(resume_text, job_text):
 def register_or_login(username, password):
     if not username or not password:
         return False, "Username and password required."
+    if is_rate_limited(username):
+        return False, "Too many failed attempts. Please wait a few minutes and try again."
 
-    db = load_db()
-    if username in db:
-        u = db[username]
-        if verify_password(u["salt"], u["pw_hash"], password):
+    u = store.get_user(username)
+    if u:
+        if verify_password(u["salt"], u["pw_hash"], password, username=username):
+            clear_failures(username)
             return True, "Login successful."
         else:
+            record_failure(username)
             return False, "Incorrect password."
     else:
         salt, h = hash_password(password)
-        db[username] = {"salt": salt, "pw_hash": h, "default_resume": None, "history": []}
-        save_db(db)
+        if not store.create_user(username, salt, h):
+            return False, "Username was just taken, please try again."
         return True, "Account created."
 
-def analyze_action(session, username, resume_file, set_default, job_desc, about_role, save_analysis):
-    if not username: return ("Username required.", "", "", "")
+def session_user(session):
+    """Username behind the tab's signed token, or None when it is missing or expired."""
+    return verify_session((session or {}).get("token"))
+
+def analyze_action(session, username_in, resume_file, set_default, job_desc, about_role, save_analysis):
+    # History and default resumes belong to the logged-in user, never the textbox.
+    username = session_user(session)
+    if not username: return ("Please log in again.", "", "", "")
+    if username_in and username_in != username:
+        return ("You can only analyze as the logged-in user.", "", "", "")
     if not job_desc: return ("Job description required.", "", "", "")
 
-    db = load_db()
     resume_text = ""
     resume_filename = None
+    features = None
+    status = "Analysis complete."
 
     if resume_file:
         fname = getattr(resume_file, "name", "")
         resume_filename = os.path.basename(fname)
 
-        if fname.lower().endswith(".pdf"):
-            resume_text = extract_text_from_pdf(fname)
-        elif fname.lower().endswith(".docx"):
-            resume_text = extract_text_from_docx(fname)
-        else:
+        if not fname.lower().endswith((".pdf", ".docx")):
             return ("Unsupported file type.", "", "", "")
+        # Read once into memory (size-limited); hashing and parsing share the buffer.
+        try:
+            with open(fname, "rb") as raw, open_upload(raw, fname) as doc:
+                if fname.lower().endswith(".pdf"):
+                    resume_text = extract_text_from_pdf(doc)
+                else:
+                    resume_text = extract_text_from_docx(doc)
+        except UploadTooLarge as e:
+            return (str(e), "", "", "")
 
         if set_default:
-            db[username]["default_resume"] = resume_text
-            save_db(db)
+            # The extractors return "" on failure; an empty default would
+            # silently score 0 on every later analysis.
+            if resume_text.strip():
+                store.set_default_features(username, build_resume_features(resume_text), resume_filename)
+            else:
+                status += " Default resume not saved: no text could be extracted from it."
 
     else:
-        if db.get(username, {}).get("default_resume"):
-            resume_text = db[username]["default_resume"]
-        else:
-            return ("No resume uploaded and no default found.", "", "", "")
+        features, resume_filename = store.get_default_features(username)
+        if features is not None and not features.get("term_indices"):
+            features = None  # an empty resume saved as default is no default at all
+        if features is None:
+            # Accounts from before feature records may still carry raw text.
+            user = store.get_user(username)
+            if not (user and user["default_resume"]):
+                return ("No resume uploaded and no default found.", "", "", "")
+            features = build_resume_features(user["default_resume"])
+            store.set_default_features(username, features)
 
     full_job_text = job_desc + ("\n" + about_role if about_role else "")
-    score = calculate_ats_score(resume_text, full_job_text)
-    missing = find_missing_keywords(resume_text, full_job_text)
-    suggestions = generate_suggestions(resume_text, full_job_text)
+    if features is None:
+        result = analyze_pair(resume_text, full_job_text)
+    else:
+        # Default resume: only the job text is processed.
+        result = analyze_with_features(features, full_job_text)
+    score, missing, suggestions = result["score"], result["missing"], result["suggestions"]
 
     if save_analysis:
-        db[username]["history"].append({
+        store.add_history(username, {
             "timestamp": datetime.utcnow().isoformat(),
             "ats_score": score,
             "missing_keywords": missing,
             "suggestions": suggestions,
             "resume_filename": resume_filename
         })
-        save_db(db)
 
     return (
-        "Analysis complete.",
+        status,
         f"### ⭐ ATS Score: **{score}/100**",
         f"### 🔍 Missing Keywords:\n{', '.join(missing) or 'None'}",
         "### 📝 Suggestions:\n" + "\n".join(suggestions)
@@ -249,7 +186,8 @@ input, textarea {
 
 """
 
-with gr.Blocks(css=css, title="ATS Resume Analyzer • OMNI_AI") as ats_app:
+with gr.Blocks(css=css, title="ATS Resume Analyzer • OMNI_AI",
+               delete_cache=(UPLOAD_CACHE_TTL, UPLOAD_CACHE_TTL)) as ats_app:
     
     session = gr.State({})
 
@@ -266,35 +204,53 @@ with gr.Blocks(css=css, title="ATS Resume Analyzer • OMNI_AI") as ats_app:
     with gr.Column(visible=False) as main_panel:
         gr.Markdown("<h1 style='text-align:center;'>📄 ATS Resume Analyzer</h1>")
 
-        with gr.Row():
-            with gr.Column(elem_classes=["card"]):
-                username_in = gr.Textbox(label="Username")
-
-                resume_file = gr.File(label="Upload Resume", file_types=[".pdf", ".docx"])
-                set_default = gr.Checkbox(label="Set as default resume?")
-                save_analysis = gr.Checkbox(label="Save this analysis?")
-
-            with gr.Column(elem_classes=["card"]):
-                job_desc = gr.Textbox(label="Job Description", lines=6)
-                about_role = gr.Textbox(label="About the Role", lines=3)
-                analyze_btn = gr.Button("Analyze Resume")
-
-        with gr.Column(elem_classes=["card"]):
-            home_status = gr.Markdown()
-            home_score = gr.Markdown()
-            home_missing = gr.Markdown()
-            home_suggestions = gr.Markdown()
+        with gr.Tabs():
+            with gr.Tab("Single Analysis"):
+                with gr.Row():
+                    with gr.Column(elem_classes=["card"]):
+                        username_in = gr.Textbox(label="Username")
+
+                        resume_file = gr.File(label="Upload Resume", file_types=[".pdf", ".docx"])
+                        set_default = gr.Checkbox(label="Set as default resume?")
+                        save_analysis = gr.Checkbox(label="Save this analysis?")
+
+                    with gr.Column(elem_classes=["card"]):
+                        job_desc = gr.Textbox(label="Job Description", lines=6)
+                        about_role = gr.Textbox(label="About the Role", lines=3)
+                        analyze_btn = gr.Button("Analyze Resume")
+
+                with gr.Column(elem_classes=["card"]):
+                    home_status = gr.Markdown()
+                    home_score = gr.Markdown()
+                    home_missing = gr.Markdown()
+                    home_suggestions = gr.Markdown()
+
+            with gr.Tab("Bulk Ranking"):
+                with gr.Row():
+                    with gr.Column(elem_classes=["card"]):
+                        bulk_file = gr.File(label="Resumes (.zip of PDF/DOCX)", file_types=[".zip"])
+                        bulk_top_k = gr.Slider(1, 200, value=20, step=1, label="Top K")
+                    with gr.Column(elem_classes=["card"]):
+                        bulk_job = gr.Textbox(label="Job Description", lines=6)
+                        bulk_btn = gr.Button("Rank Resumes")
+                with gr.Column(elem_classes=["card"]):
+                    bulk_status = gr.Markdown()
+                    bulk_table = gr.Dataframe(headers=["Rank", "Candidate", "ATS Score", "Missing Keywords"])
+                    bulk_csv = gr.File(label="Download CSV")
 
     def login_handler(session, username, password):
         success, msg = register_or_login(username, password)
         if success:
-            session.update({"username": username})
+            session.update({"username": username, "token": issue_session(username)})
             return (
                 gr.update(visible=False),
                 gr.update(visible=True),
                 gr.update(value=f"### {msg} — Welcome **{username}**"),
                 session
             )
+        # A failed attempt also drops any token the tab held from an earlier login.
+        session.pop("token", None)
+        session.pop("username", None)
         return (
             gr.update(visible=True),
             gr.update(visible=False),
@@ -303,16 +259,44 @@ with gr.Blocks(css=css, title="ATS Resume Analyzer • OMNI_AI") as ats_app:
         )
 
     login_btn.click(
-        fn=login_handler,
+        fn=get_ats_server().track(login_handler),
         inputs=[session, login_user, login_pw],
         outputs=[login_panel, main_panel, login_msg, session]
     )
 
+    def bulk_handler(session, zip_file, job_text, top_k):
+        if not session_user(session):
+            yield "Please log in again.", None, None
+            return
+        if not zip_file or not job_text:
+            yield "Upload a .zip of resumes and a job description.", None, None
+            return
+        # Gradio copies the CSV into its own cache when the final update is
+        # sent, so the job's directory can go as soon as the handler ends.
+        with tempfile.TemporaryDirectory(prefix="ats_ranking_") as workdir:
+            try:
+                for event in rank_resumes(getattr(zip_file, "name", zip_file), job_text, top_k=int(top_k)):
+                    if event["stage"] == "extract":
+                        yield f"📄 Extracted {event['done']}/{event['total']} resumes...", None, None
+                    elif event["stage"] == "score":
+                        yield f"🧮 Scoring {event['total']} resumes...", None, None
+                    else:
+                        rows = [[r["rank"], r["candidate"], r["ats_score"], ", ".join(r["missing_keywords"][:10])]
+                                for r in event["results"]]
+                        csv_path = write_csv(event["results"], os.path.join(workdir, "ats_ranking.csv"))
+                        yield f"✅ Ranked {event['total']} resumes.", rows, csv_path
+            except ValueError as e:
+                # Archive limits (UploadTooLarge is a ValueError) and non-zip uploads.
+                yield f"❌ {e}", None, None
+
+    bulk_btn.click(
+        fn=get_ats_server().track(bulk_handler),
+        inputs=[session, bulk_file, bulk_job, bulk_top_k],
+        outputs=[bulk_status, bulk_table, bulk_csv]
+    )
+
     analyze_btn.click(
-        fn=lambda s, u, f, sd, j, a, save: analyze_action(s, u, f, sd, j, a, save),
+        fn=get_ats_server().track(analyze_action),
         inputs=[session, username_in, resume_file, set_default, job_desc, about_role, save_analysis],
         outputs=[home_status, home_score, home_missing, home_suggestions]
     )
-
-def launch_ats():
-    ats_app.launch(server_name="0.0.0.0", server_port=7861)
@@ -0,0 +1,149 @@
+# tools/ats_portal/auth.py
+"""
+Authentication helpers for the ATS portal.
+
+PBKDF2 runs in a bounded process pool so a burst of logins spreads across
+cores instead of queueing on the handler threads. Successful logins get an
+HMAC-signed session token (and a short-lived verified-credentials cache), so
+repeat requests skip PBKDF2 entirely. Failed attempts are rate limited per
+user, and every comparison is constant time.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from tools.procpool import process_pool
+
+PBKDF2_ITERATIONS = 200000
+HASH_WORKERS = int(os.environ.get("ATS_HASH_WORKERS", str(os.cpu_count() or 2)))
+SESSION_TTL = int(os.environ.get("ATS_SESSION_TTL", str(12 * 3600)))
+VERIFIED_CACHE_TTL = int(os.environ.get("ATS_VERIFIED_CACHE_TTL", "600"))
+MAX_FAILURES = int(os.environ.get("ATS_MAX_LOGIN_FAILURES", "5"))
+FAILURE_WINDOW = int(os.environ.get("ATS_LOGIN_FAILURE_WINDOW", "300"))
+
+# Tokens signed with a per-process secret stop validating after a restart,
+# which is fine for UI sessions; set ATS_SESSION_SECRET to share across workers.
+_SECRET = os.environ.get("ATS_SESSION_SECRET", "").encode() or os.urandom(32)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+_verified = {}  # keyed HMAC of (username, password, stored hash) -> expiry
+_verified_lock = threading.Lock()
+
+_failures = defaultdict(deque)
+_failures_lock = threading.Lock()
+
+
+def _pbkdf2(password: str, salt: bytes) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS)
+
+
+def _hash_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = process_pool(HASH_WORKERS)
+        return _pool
+
+
+def _derive(password: str, salt: bytes) -> bytes:
+    try:
+        return _hash_pool().submit(_pbkdf2, password, salt).result()
+    except Exception:
+        # A broken pool (e.g. a killed worker) should not lock everyone out.
+        return _pbkdf2(password, salt)
+
+
+# -------------------------
+# Password hashing
+# -------------------------
+def hash_password(password: str, salt: bytes = None):
+    if salt is None:
+        salt = os.urandom(16)
+    dk = _derive(password, salt)
+    return binascii.hexlify(salt).decode(), binascii.hexlify(dk).decode()
+
+
+def _verified_key(username: str, password: str, stored_hash_hex: str) -> str:
+    msg = "\0".join([username, password, stored_hash_hex]).encode("utf-8")
+    return hmac.new(_SECRET, msg, hashlib.sha256).hexdigest()
+
+
+def verify_password(stored_salt_hex: str, stored_hash_hex: str, password_attempt: str, username: str = "") -> bool:
+    key = _verified_key(username, password_attempt, stored_hash_hex)
+    now = time.time()
+    with _verified_lock:
+        if _verified.get(key, 0) > now:
+            return True
+
+    salt = binascii.unhexlify(stored_salt_hex.encode())
+    attempt_hash = binascii.hexlify(_derive(password_attempt, salt)).decode()
+    ok = hmac.compare_digest(attempt_hash, stored_hash_hex)
+    if ok:
+        with _verified_lock:
+            if len(_verified) > 10000:
+                for k in [k for k, exp in _verified.items() if exp <= now]:
+                    del _verified[k]
+            _verified[key] = now + VERIFIED_CACHE_TTL
+    return ok
+
+
+# -------------------------
+# Rate limiting
+# -------------------------
+def is_rate_limited(username: str) -> bool:
+    cutoff = time.time() - FAILURE_WINDOW
+    with _failures_lock:
+        attempts = _failures.get(username)
+        if not attempts:
+            return False
+        while attempts and attempts[0] < cutoff:
+            attempts.popleft()
+        if not attempts:
+            del _failures[username]
+            return False
+        return len(attempts) >= MAX_FAILURES
+
+
+def record_failure(username: str):
+    with _failures_lock:
+        _failures[username].append(time.time())
+
+
+def clear_failures(username: str):
+    with _failures_lock:
+        _failures.pop(username, None)
+
+
+# -------------------------
+# Signed session tokens
+# -------------------------
+def _sign(payload: str) -> str:
+    return hmac.new(_SECRET, payload.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def issue_session(username: str) -> str:
+    user_b64 = base64.urlsafe_b64encode(username.encode("utf-8")).decode().rstrip("=")
+    payload = f"{user_b64}.{int(time.time()) + SESSION_TTL}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_session(token: str):
+    """Return the username a valid, unexpired token was issued for, else None."""
+    try:
+        user_b64, expiry, sig = (token or "").split(".")
+    except ValueError:
+        return None
+    if not hmac.compare_digest(sig, _sign(f"{user_b64}.{expiry}")):
+        return None
+    if int(expiry) < time.time():
+        return None
+    padded = user_b64 + "=" * (-len(user_b64) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode("utf-8")
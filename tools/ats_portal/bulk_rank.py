@@ -0,0 +1,158 @@
+# tools/ats_portal/bulk_rank.py
+"""
+Bulk resume-vs-job ranking for recruiters.
+
+Resumes from a directory or .zip are extracted in a process pool, scored
+against the job in one vectorized pass, and ranked top-K with the missing
+keywords for each candidate. `rank_resumes` yields progress events as it goes
+so both the CLI and the portal tab can stream them.
+
+    python -m tools.ats_portal.bulk_rank resumes.zip --job job.txt --top-k 20 --csv ranking.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import as_completed
+
+import numpy as np
+
+from tools.ats_portal.analysis import (
+    extract_text_from_pdf, extract_text_from_docx, calculate_ats_scores, get_keywords
+)
+from tools.procpool import process_pool
+from tools.uploads import copy_bounded, MAX_UPLOAD_BYTES
+
+SUPPORTED = (".pdf", ".docx")
+WORKERS = int(os.environ.get("ATS_BULK_WORKERS", str(os.cpu_count() or 2)))
+# Archive limits: resumes per .zip and total extracted bytes (per resume: MAX_UPLOAD_BYTES).
+MAX_RESUMES = int(os.environ.get("ATS_BULK_MAX_RESUMES", "5000"))
+MAX_EXTRACTED_BYTES = int(os.environ.get("ATS_BULK_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+
+def collect_resumes(source, workdir):
+    """
+    Return sorted (path, display_name) pairs for the resumes in a directory
+    or a .zip; archives are extracted flat into `workdir`, within the
+    MAX_RESUMES / MAX_UPLOAD_BYTES / MAX_EXTRACTED_BYTES limits.
+    """
+    if zipfile.is_zipfile(source):
+        resumes = []
+        extracted = 0
+        with zipfile.ZipFile(source) as zf:
+            for n, member in enumerate(zf.infolist()):
+                name = os.path.basename(member.filename)
+                if member.is_dir() or not name.lower().endswith(SUPPORTED) or name.startswith("."):
+                    continue
+                if len(resumes) >= MAX_RESUMES:
+                    raise ValueError(f"At most {MAX_RESUMES} resumes per archive.")
+                # Never trust archive paths or declared sizes; stream under a
+                # numbered flat name and count the bytes actually written.
+                target = os.path.join(workdir, f"{n}{os.path.splitext(name)[1].lower()}")
+                budget = min(MAX_UPLOAD_BYTES, MAX_EXTRACTED_BYTES - extracted)
+                with zf.open(member) as src, open(target, "wb") as dst:
+                    extracted += copy_bounded(src, dst, name, budget)
+                resumes.append((target, member.filename))
+        return sorted(resumes, key=lambda r: r[1])
+
+    if not os.path.isdir(source):
+        raise ValueError(f"{source} is neither a directory nor a .zip file")
+    resumes = []
+    for dirpath, _, filenames in os.walk(source):
+        for f in filenames:
+            if f.lower().endswith(SUPPORTED):
+                path = os.path.join(dirpath, f)
+                resumes.append((path, os.path.relpath(path, source)))
+    return sorted(resumes, key=lambda r: r[1])
+
+
+def _extract(path):
+    if path.lower().endswith(".pdf"):
+        return extract_text_from_pdf(path)
+    return extract_text_from_docx(path)
+
+
+def rank_resumes(source, job_text, top_k=20, workers=WORKERS):
+    """
+    Generator of progress events:
+    {"stage": "extract", "done", "total"} while parsing, then a final
+    {"stage": "done", "total", "results": [...top_k rows...]}.
+    """
+    with tempfile.TemporaryDirectory(prefix="ats_bulk_") as workdir:
+        resumes = collect_resumes(source, workdir)
+        paths = [path for path, _ in resumes]
+        total = len(paths)
+        texts = [""] * total
+        yield {"stage": "extract", "done": 0, "total": total}
+
+        if total:
+            with process_pool(min(workers, total)) as pool:
+                futures = {pool.submit(_extract, p): i for i, p in enumerate(paths)}
+                for done, future in enumerate(as_completed(futures), 1):
+                    try:
+                        texts[futures[future]] = future.result() or ""
+                    except Exception as e:
+                        print(f"⚠️ Could not extract {paths[futures[future]]}: {e}", file=sys.stderr)
+                    yield {"stage": "extract", "done": done, "total": total}
+
+        yield {"stage": "score", "done": 0, "total": total}
+        scores = np.asarray(calculate_ats_scores(texts, job_text), dtype=float)
+        k = min(top_k, total)
+        top = np.argsort(-scores, kind="stable")[:k] if k else []
+
+        job_keywords = set(get_keywords(job_text, 60))
+        results = []
+        for rank, i in enumerate(top, 1):
+            missing = sorted(job_keywords - set(get_keywords(texts[i], 60)))
+            results.append({
+                "rank": rank,
+                "candidate": resumes[i][1],
+                "ats_score": float(scores[i]),
+                "missing_keywords": missing,
+                "extracted": bool(texts[i]),
+            })
+        yield {"stage": "done", "total": total, "results": results}
+
+
+def write_csv(results, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", "candidate", "ats_score", "missing_keywords"])
+        for r in results:
+            writer.writerow([r["rank"], r["candidate"], r["ats_score"], "; ".join(r["missing_keywords"])])
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank resumes against a job description.")
+    parser.add_argument("source", help="Directory or .zip of .pdf/.docx resumes")
+    parser.add_argument("--job", required=True, help="Path to a text file with the job description")
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--csv", help="Write the ranking to this CSV file")
+    args = parser.parse_args(argv)
+
+    with open(args.job, "r", encoding="utf-8", errors="ignore") as f:
+        job_text = f.read()
+
+    results = []
+    for event in rank_resumes(args.source, job_text, top_k=args.top_k, workers=args.workers):
+        if event["stage"] == "extract":
+            print(f"\r📄 Extracted {event['done']}/{event['total']}", end="", file=sys.stderr)
+        elif event["stage"] == "score":
+            print(f"\n🧮 Scoring {event['total']} resumes...", file=sys.stderr)
+        else:
+            results = event["results"]
+
+    for r in results:
+        print(f"{r['rank']:>3}. {r['ats_score']:>6.2f}  {r['candidate']}  missing: {', '.join(r['missing_keywords'][:8]) or '-'}")
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"✅ Wrote {args.csv}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# tools/ats_portal/scoring.py
+"""
+Corpus-backed TF-IDF scoring for the ATS analyzer.
+
+Documents are hashed into a fixed feature space, so the vocabulary never has
+to be refit. Document frequencies accumulate over every resume and job
+description the portal sees and are persisted to disk. Scoring is then
+`transform` + one sparse matrix product, and it works for one pair, one resume
+against many jobs, or many resumes against one job.
+
+Weights follow TfidfVectorizer's defaults: raw term counts, smooth idf
+ln((1 + n) / (1 + df)) + 1, and l2-normalised rows.
+
+Several processes (gunicorn workers, the bulk_rank CLI) may share one corpus
+file. Each engine keeps the documents it counted since its last save and
+merges them into the file under a lock, so no process overwrites another's
+counts. Saves run on a background thread, never on the request path.
+"""
+
+import atexit
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, just not serialized across processes
+    fcntl = None
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_FILE = os.environ.get("ATS_TFIDF_MODEL", os.path.join(BASE_DIR, "tfidf_corpus.npz"))
+N_FEATURES = 2 ** 18
+SAVE_INTERVAL = 30  # seconds between automatic saves of the corpus statistics
+MAX_SEEN = int(os.environ.get("ATS_TFIDF_MAX_SEEN", "200000"))  # document digests remembered for dedup
+
+
+@contextmanager
+def _file_lock(path):
+    with open(path, "a") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _trim_seen(seen):
+    """Forget the oldest digests beyond MAX_SEEN; a forgotten document may be counted again."""
+    for digest in list(islice(seen, max(len(seen) - MAX_SEEN, 0))):
+        del seen[digest]
+
+
+class ScoringEngine:
+    def __init__(self, path=MODEL_FILE, n_features=N_FEATURES):
+        self.path = path
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None, lowercase=True
+        )
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        self._seen = {}  # 64-bit digests of documents already counted, oldest first
+        self._pending = {}  # digest -> feature indices, for documents counted since the last save
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._saving = False
+        self._last_save = time.time()
+        self._load()
+
+    def _read(self):
+        """(df, n_docs, seen digests) from the corpus file, or None if absent/unusable."""
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path) as data:
+            if data["df"].shape != self.df.shape:
+                return None
+            seen = data["seen"].tolist() if "seen" in data else []
+            return data["df"].astype(np.int64), int(data["n_docs"]), seen
+
+    def _load(self):
+        try:
+            stored = self._read()
+        except Exception as e:
+            print(f"⚠️ Could not load TF-IDF corpus from {self.path}: {e}")
+            return
+        if stored:
+            self.df, self.n_docs, seen = stored
+            self._seen = dict.fromkeys(seen)
+            _trim_seen(self._seen)
+
+    def _present(self, pending):
+        if not pending:
+            return np.zeros(self.df.shape[0], dtype=np.int64)
+        return np.bincount(np.concatenate(list(pending.values())), minlength=self.df.shape[0])
+
+    def save(self):
+        """
+        Merge the documents counted since the last save into the corpus file
+        (skipping any another process already counted) and adopt the merged
+        totals. On failure the pending documents are kept for the next save.
+        """
+        with self._save_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_save = time.time()
+            if not pending:
+                return
+            try:
+                with _file_lock(self.path + ".lock"):
+                    try:
+                        stored = self._read()
+                    except Exception as e:
+                        print(f"⚠️ Unreadable TF-IDF corpus at {self.path}, rewriting it: {e}")
+                        stored = None
+                    df, n_docs, seen = stored or (np.zeros_like(self.df), 0, [])
+                    seen = dict.fromkeys(seen)
+                    new = {d: idx for d, idx in pending.items() if d not in seen}
+                    df = df + self._present(new)
+                    n_docs += len(new)
+                    seen.update(dict.fromkeys(new))
+                    _trim_seen(seen)
+
+                    tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+                    np.savez_compressed(tmp, df=df, n_docs=n_docs, seen=np.fromiter(seen, dtype=np.uint64, count=len(seen)))
+                    os.replace(tmp, self.path)
+            except Exception:
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                raise
+
+            with self._lock:
+                # Documents counted while the file was being written stay pending.
+                self.df = df + self._present(self._pending)
+                self.n_docs = n_docs + len(self._pending)
+                seen.update(dict.fromkeys(self._pending))
+                _trim_seen(seen)
+                self._seen = seen
+
+    def _background_save(self):
+        try:
+            self.save()
+        except Exception as e:
+            print(f"⚠️ Could not save TF-IDF corpus to {self.path}: {e}")
+        finally:
+            with self._lock:
+                self._saving = False
+
+    def add_documents(self, texts):
+        """Fold new documents into the corpus document frequencies (each text counted once)."""
+        fresh = {}
+        for t in texts:
+            if t:
+                digest = int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little")
+                fresh.setdefault(digest, t)
+        with self._lock:
+            fresh = {d: t for d, t in fresh.items() if d not in self._seen}
+            self._seen.update(dict.fromkeys(fresh))
+            _trim_seen(self._seen)
+        if not fresh:
+            return
+        counts = self.vectorizer.transform(list(fresh.values())).tocsr()
+        counts.sum_duplicates()
+        rows = {d: counts.indices[counts.indptr[i]:counts.indptr[i + 1]].copy() for i, d in enumerate(fresh)}
+        with self._lock:
+            self.df += self._present(rows)
+            self.n_docs += len(rows)
+            self._pending.update(rows)
+            due = not self._saving and time.time() - self._last_save > SAVE_INTERVAL
+            self._saving = self._saving or due
+        if due:
+            threading.Thread(target=self._background_save, name="tfidf-save", daemon=True).start()
+
+    def idf(self, indices=None):
+        """Smoothed IDF for the whole feature space, or only for `indices`."""
+        with self._lock:
+            df = self.df if indices is None else self.df[indices]
+            n_docs = self.n_docs
+        return np.log((1 + n_docs) / (1 + df)) + 1
+
+    def _weight(self, counts):
+        # Only the non-zero columns need an IDF; a full 2**18 log per call dominated scoring.
+        counts.data *= self.idf(counts.indices)
+        return normalize(counts, norm="l2", copy=False)
+
+    def transform(self, texts):
+        """l2-normalised TF-IDF rows for `texts` (sparse, one row per text)."""
+        return self._weight(self.vectorizer.transform(texts).tocsr().astype(np.float64))
+
+    def count_vector(self, text):
+        """Hashed term counts for one document as (indices, counts) lists."""
+        row = self.vectorizer.transform([text]).tocsr()
+        return row.indices.tolist(), row.data.astype(int).tolist()
+
+    def from_counts(self, indices, counts):
+        """l2-normalised TF-IDF row for stored term counts, using the current IDF."""
+        row = csr_matrix(
+            (np.asarray(counts, dtype=np.float64), np.asarray(indices, dtype=np.int64), [0, len(indices)]),
+            shape=(1, self.df.shape[0]),
+        )
+        return self._weight(row)
+
+    def score_counts(self, indices, counts, job_texts):
+        """Score a stored resume vector against job texts; returns an array of scores."""
+        if not indices or not job_texts:
+            return np.zeros(len(job_texts))
+        return (self.from_counts(indices, counts) @ self.transform(job_texts).T).toarray()[0] * 100
+
+    def score_matrix(self, resume_texts, job_texts):
+        """Cosine similarity * 100 for every (resume, job) pair, as a dense array."""
+        if not resume_texts or not job_texts:
+            return np.zeros((len(resume_texts), len(job_texts)))
+        rows = self.transform(list(resume_texts) + list(job_texts))
+        n = len(resume_texts)
+        return (rows[:n] @ rows[n:].T).toarray() * 100
+
+    def score_one_to_many(self, resume_text, job_texts):
+        return self.score_matrix([resume_text], job_texts)[0]
+
+    def score_many_to_one(self, resume_texts, job_text):
+        return self.score_matrix(resume_texts, [job_text])[:, 0]
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ScoringEngine()
+            atexit.register(_engine.save)
+        return _engine
@@ -0,0 +1,175 @@
+# tools/ats_portal/server.py
+"""
+Singleton, supervised Gradio sub-server for the ATS portal.
+
+The first `/ats` visit launches `ats_app` once (non-blocking) with a shared
+request queue. A watchdog thread relaunches the server when its thread has
+died or after several consecutive failed health checks (a busy server can
+miss one), and lets in-flight handlers (see `track`) finish before closing.
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from tools.uploads import MAX_REQUEST_BYTES
+
+ATS_HOST = os.environ.get("ATS_HOST", "0.0.0.0")
+ATS_PORT = int(os.environ.get("ATS_PORT", "7861"))
+ATS_PUBLIC_URL = os.environ.get("ATS_PUBLIC_URL", f"http://127.0.0.1:{ATS_PORT}")
+ATS_CONCURRENCY = int(os.environ.get("ATS_CONCURRENCY", "4"))
+ATS_MAX_QUEUE = int(os.environ.get("ATS_MAX_QUEUE", "64"))
+HEALTH_INTERVAL = float(os.environ.get("ATS_HEALTH_INTERVAL", "30"))
+HEALTH_FAILURES = int(os.environ.get("ATS_HEALTH_FAILURES", "3"))
+DRAIN_TIMEOUT = float(os.environ.get("ATS_DRAIN_TIMEOUT", "60"))
+
+
+class AtsServer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._app = None
+        self._watchdog = None
+        self.launches = 0
+        self.last_launch = None
+        self.last_error = None
+        self.failures = 0
+        self._inflight = 0
+        self._idle = threading.Condition()
+
+    def _local_url(self):
+        return f"http://127.0.0.1:{ATS_PORT}/"
+
+    def healthy(self, timeout=2):
+        if self._app is None:
+            return False
+        try:
+            with urllib.request.urlopen(self._local_url(), timeout=timeout) as resp:
+                return resp.status == 200
+        except Exception:
+            return False
+
+    def _thread_alive(self):
+        # Gradio runs uvicorn on `app.server.thread`; if that is not exposed,
+        # only the health checks can tell.
+        thread = getattr(getattr(self._app, "server", None), "thread", None)
+        return thread is None or thread.is_alive()
+
+    # -------------------------
+    # In-flight tracking
+    # -------------------------
+    @contextmanager
+    def _busy(self):
+        with self._idle:
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            with self._idle:
+                self._inflight -= 1
+                self._idle.notify_all()
+
+    def track(self, fn):
+        """Wrap a Gradio handler (plain or generator) so restarts wait for it."""
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self._busy():
+                    yield from fn(*args, **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self._busy():
+                    return fn(*args, **kwargs)
+        return wrapper
+
+    def _drain(self, timeout=DRAIN_TIMEOUT):
+        with self._idle:
+            return self._idle.wait_for(lambda: self._inflight == 0, timeout)
+
+    def _configure_queue(self, app):
+        try:
+            app.queue(default_concurrency_limit=ATS_CONCURRENCY, max_size=ATS_MAX_QUEUE)
+        except TypeError:
+            # Gradio 3.x spells the worker limit `concurrency_count`.
+            app.queue(concurrency_count=ATS_CONCURRENCY, max_size=ATS_MAX_QUEUE)
+
+    def _launch(self):
+        from tools.ats_portal.ats_app import ats_app
+
+        if self._app is not None:
+            try:
+                self._app.close()
+            except Exception:
+                pass
+        self._configure_queue(ats_app)
+        ats_app.launch(
+            server_name=ATS_HOST, server_port=ATS_PORT, prevent_thread_lock=True,
+            max_file_size=MAX_REQUEST_BYTES,
+        )
+        self._app = ats_app
+        self.launches += 1
+        self.last_launch = time.time()
+        print(f"💼 ATS portal listening on {ATS_PUBLIC_URL} (concurrency {ATS_CONCURRENCY})")
+
+    def ensure_running(self):
+        with self._lock:
+            # Once launched, a slow page under load is the watchdog's call, not
+            # a reason for a visitor to restart everyone's analyses.
+            if self._app is not None and self._thread_alive():
+                return True
+            return self._start()
+
+    def _start(self):
+        try:
+            self._launch()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ ATS portal failed to start: {self.last_error}")
+            return False
+        self.failures = 0
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._supervise, name="ats-watchdog", daemon=True)
+            self._watchdog.start()
+        return True
+
+    def _supervise(self):
+        while True:
+            time.sleep(HEALTH_INTERVAL)
+            if self.healthy(timeout=5):
+                self.failures = 0
+                continue
+            self.failures += 1
+            dead = not self._thread_alive()
+            if not dead and self.failures < HEALTH_FAILURES:
+                continue
+            reason = "server thread died" if dead else f"failed {self.failures} health checks in a row"
+            print(f"♻️ ATS portal {reason}, relaunching")
+            if not dead and not self._drain():
+                print(f"⚠️ ATS portal still busy after {DRAIN_TIMEOUT:g}s, closing anyway")
+            with self._lock:
+                self._start()
+
+    def status(self):
+        return {
+            "healthy": self.healthy(),
+            "url": ATS_PUBLIC_URL,
+            "concurrency": ATS_CONCURRENCY,
+            "max_queue": ATS_MAX_QUEUE,
+            "launches": self.launches,
+            "consecutive_failures": self.failures,
+            "in_flight": self._inflight,
+            "last_launch": self.last_launch,
+            "last_error": self.last_error,
+        }
+
+
+_server = AtsServer()
+
+
+def get_ats_server():
+    return _server
@@ -0,0 +1,179 @@
+# tools/ats_portal/user_store.py
+"""
+Transactional user store for the ATS portal (SQLite, WAL mode).
+
+Users and their analysis history live in separate, indexed tables, so a
+login reads one row and saving an analysis appends one row. On first use the
+legacy resume_portal_db.json is imported once.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_FILE = os.environ.get("ATS_STORE_DB", os.path.join(BASE_DIR, "resume_portal.sqlite3"))
+LEGACY_JSON = os.path.join(BASE_DIR, "resume_portal_db.json")
+
+
+class UserStore:
+    def __init__(self, path=STORE_FILE, legacy_json=LEGACY_JSON):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS users (
+                    username TEXT PRIMARY KEY,
+                    salt TEXT NOT NULL,
+                    pw_hash TEXT NOT NULL,
+                    default_resume TEXT
+                );
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL REFERENCES users(username),
+                    timestamp TEXT NOT NULL,
+                    ats_score REAL,
+                    missing_keywords TEXT,
+                    suggestions TEXT,
+                    resume_filename TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_history_user_time ON history(username, timestamp);
+                CREATE TABLE IF NOT EXISTS resume_features (
+                    username TEXT PRIMARY KEY REFERENCES users(username),
+                    features TEXT NOT NULL,
+                    resume_filename TEXT,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+        self._migrate_json(legacy_json)
+
+    def _conn(self):
+        # One connection per thread; Gradio runs handlers on a worker pool.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _migrate_json(self, legacy_json):
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+        db = {}
+        if os.path.exists(legacy_json):
+            try:
+                with open(legacy_json, "r") as f:
+                    db = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Could not read {legacy_json} for migration: {e}")
+        with conn:
+            # Claiming the marker first takes the write lock, so a second
+            # worker starting at the same time waits and then skips the import.
+            claimed = conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('json_migrated', ?)", (str(len(db)),)
+            ).rowcount
+            if not claimed:
+                return
+            for username, u in db.items():
+                conn.execute(
+                    "INSERT OR IGNORE INTO users (username, salt, pw_hash, default_resume) VALUES (?, ?, ?, ?)",
+                    (username, u["salt"], u["pw_hash"], u.get("default_resume")),
+                )
+                for h in u.get("history", []):
+                    self._insert_history(conn, username, h)
+        if db:
+            print(f"📦 Migrated {len(db)} ATS users from {os.path.basename(legacy_json)}")
+
+    @staticmethod
+    def _insert_history(conn, username, entry):
+        conn.execute(
+            "INSERT INTO history (username, timestamp, ats_score, missing_keywords, suggestions, resume_filename) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                username,
+                entry.get("timestamp"),
+                entry.get("ats_score"),
+                json.dumps(entry.get("missing_keywords", [])),
+                json.dumps(entry.get("suggestions", [])),
+                entry.get("resume_filename"),
+            ),
+        )
+
+    def get_user(self, username):
+        row = self._conn().execute(
+            "SELECT username, salt, pw_hash, default_resume FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def create_user(self, username, salt, pw_hash):
+        """Insert a new user; returns False if the name was taken meanwhile."""
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO users (username, salt, pw_hash, default_resume) VALUES (?, ?, ?, NULL)",
+                (username, salt, pw_hash),
+            )
+        return cur.rowcount == 1
+
+    def set_default_resume(self, username, resume_text):
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE users SET default_resume = ? WHERE username = ?", (resume_text, username))
+
+    def set_default_features(self, username, features, resume_filename=None):
+        """Store the pre-analysed default resume and drop any legacy raw text."""
+        conn = self._conn()
+        with conn:
+            if not conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO resume_features (username, features, resume_filename, updated_at) "
+                "VALUES (?, ?, ?, strftime('%s','now'))",
+                (username, json.dumps(features), resume_filename),
+            )
+            conn.execute("UPDATE users SET default_resume = NULL WHERE username = ?", (username,))
+        return True
+
+    def get_default_features(self, username):
+        row = self._conn().execute(
+            "SELECT features, resume_filename FROM resume_features WHERE username = ?", (username,)
+        ).fetchone()
+        if not row:
+            return None, None
+        return json.loads(row["features"]), row["resume_filename"]
+
+    def add_history(self, username, entry):
+        conn = self._conn()
+        with conn:
+            self._insert_history(conn, username, entry)
+
+    def get_history(self, username, limit=50):
+        rows = self._conn().execute(
+            "SELECT timestamp, ats_score, missing_keywords, suggestions, resume_filename FROM history "
+            "WHERE username = ? ORDER BY timestamp DESC LIMIT ?",
+            (username, limit),
+        ).fetchall()
+        history = []
+        for r in rows:
+            entry = dict(r)
+            entry["missing_keywords"] = json.loads(entry["missing_keywords"] or "[]")
+            entry["suggestions"] = json.loads(entry["suggestions"] or "[]")
+            history.append(entry)
+        return history
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UserStore()
+        return _store
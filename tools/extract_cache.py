@@ -0,0 +1,131 @@
+# tools/extract_cache.py
+"""
+Content-addressed cache of extracted document text, shared by the ATS portal
+and the text detector.
+
+Entries are keyed by a BLAKE2 hash of the file bytes plus the extractor name,
+so the same resume uploaded under any filename is parsed only once. Text is
+stored gzip-compressed on disk. Once the store outgrows its byte budget, the
+least recently used entries (by mtime, refreshed on every hit) are evicted.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("OMNIAI_EXTRACT_CACHE_DIR", os.path.join(ROOT_DIR, ".cache", "extracted"))
+CACHE_MAX_BYTES = int(os.environ.get("OMNIAI_EXTRACT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def _digest_stream(f, kind):
+    h = hashlib.blake2b(kind.encode("utf-8"), digest_size=20)
+    for chunk in iter(lambda: f.read(1 << 20), b""):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def file_digest(source, kind=""):
+    """Digest of a path's bytes, or of a seekable binary file (rewound afterwards)."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return _digest_stream(f, kind)
+    source.seek(0)
+    digest = _digest_stream(source, kind)
+    source.seek(0)
+    return digest
+
+
+class ExtractionCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(e.stat().st_size for e in os.scandir(directory) if e.name.endswith(".txt.gz"))
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.txt.gz")
+
+    def get(self, digest):
+        path = self._path(digest)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+        except (FileNotFoundError, OSError, EOFError):
+            with self._lock:
+                self.counters["misses"] += 1
+            return None
+        with self._lock:
+            self.counters["hits"] += 1
+        return text
+
+    def put(self, digest, text):
+        path = self._path(digest)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(text or "")
+        size = os.path.getsize(tmp)
+        os.replace(tmp, path)
+        with self._lock:
+            self._bytes += size
+            over = self._bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = sorted(
+                (e for e in os.scandir(self.directory) if e.name.endswith(".txt.gz")),
+                key=lambda e: e.stat().st_mtime,
+            )
+            total = sum(e.stat().st_size for e in entries)
+            target = self.max_bytes * 0.9
+            for e in entries:
+                if total <= target:
+                    break
+                try:
+                    size = e.stat().st_size
+                    os.remove(e.path)
+                    total -= size
+                    self.counters["evictions"] += 1
+                except OSError:
+                    pass
+            self._bytes = total
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            counters["bytes"] = self._bytes
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else 0
+        return counters
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_extract_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+        return _cache
+
+
+def cached_extract(source, extractor, kind):
+    """
+    Return extractor(source), reusing a previous result for identical file
+    bytes. `source` is a path or an in-memory/spooled upload.
+    """
+    cache = get_extract_cache()
+    digest = file_digest(source, kind)
+    text = cache.get(digest)
+    if text is None:
+        text = extractor(source)
+        cache.put(digest, text)
+    return text
@@ -1,56 +1,82 @@
-from playwright.sync_api import sync_playwright
-from fuzzywuzzy import fuzz
-import re, time
+from .browser_pool import get_pool, raise_if_cancelled
+from .readiness import wait_for_form, wait_for_submission
+from .form_schema import extract_form_schema, clean_label, FILLABLE_TYPES
+from .schema_cache import get_cache, fingerprint
+from .matcher import FieldMatcher, FILL_THRESHOLD, MATCH_MODE
 
-def fill_google_form(url, user_data):
+def fill_google_form(url, user_data, timeout=None, matcher=None):
+    """
+    Fill and submit one form; returns the number of fields filled. Errors
+    other than a timeout are raised before Submit is clicked, so only those
+    are safe to retry.
+    """
     print(f"\n📝 Opening form: {url}")
     print(f"🧠 User Provided Fields: {list(user_data.keys())}")
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
-        page = browser.new_page()
-        page.goto(url)
-        time.sleep(2)
+    matcher = matcher or FieldMatcher(user_data)
+    cache = get_cache()
+    cached_schema = cache.get(url)
 
-        blocks = page.locator('div[role="listitem"]')
-        inputs = page.locator('input[type="text"]')
+    def _fill(page):
+        if timeout:
+            page.set_default_timeout(timeout * 1000)
+        response = page.goto(url)
+        ready, timings = wait_for_form(page)
+        if not ready:
+            # Raised before anything is filled or submitted, so this is retryable.
+            raise RuntimeError(f"Form did not load (no question blocks after {timings['form_blocks']} ms)")
+        print(f"⏱️ Form ready: {timings}")
+
+        if cached_schema is not None:
+            schema = cached_schema
+            scanned = None
+        else:
+            schema = extract_form_schema(page)
+            scanned = (
+                schema,
+                fingerprint(response.text() if response else ""),
+                response.headers.get("etag") if response else None,
+            )
+
+        fields = [f for f in schema if f["type"] in FILLABLE_TYPES and f["input"]]
         filled = 0
 
         print("🔍 Scanning form fields...")
-        for i in range(inputs.count()):
-            label = ""
-            try:
-                block = blocks.nth(i)
-                label_el = block.locator('div[role="heading"]')
-                raw_label = label_el.inner_text().strip()
-                label = re.sub(r"[*:]", "", raw_label).strip()
-            except:
-                label = ""
-
-            print(f"🧾 Cleaned Label: '{label}'")
-
-            best_match = None
-            best_score = 0
-            for key in user_data:
-                score = fuzz.token_sort_ratio(key.lower(), label.lower())
-                print(f" 🔄 Matching user field '{key}' with form label '{label}' → score: {score}")
-                if score > best_score and score >= 60:
-                    best_match = key
-                    best_score = score
+        labels = [clean_label(f["label"]) for f in fields]
+        if MATCH_MODE == "best":
+            matches = [(key, score / 100) for key, score in matcher.best_matches(labels, FILL_THRESHOLD)]
+        else:
+            matches = matcher.assign(labels, FILL_THRESHOLD)
 
+        for field, label, (best_match, confidence) in zip(fields, labels, matches):
             if best_match:
-                print(f"✅ Filling: {label} with '{user_data[best_match]}'")
-                inputs.nth(i).fill(user_data[best_match])
+                print(f"✅ Filling: {label} with '{user_data[best_match]}' (match '{best_match}', confidence {confidence:.2f})")
+                target = field["input"]
+                page.locator(target["selector"]).nth(target["index"]).fill(user_data[best_match])
                 filled += 1
             else:
                 print(f"⚠️ No good match for: {label}")
 
+        # Past this point the form may be sent; a caller that already timed
+        # out must not have it submitted behind its back.
+        raise_if_cancelled()
         try:
             page.locator('div[role="button"]', has_text="Submit").click()
-            time.sleep(1)
-            print("🚀 Form submitted!")
+            confirmed, timings = wait_for_submission(page)
+            if confirmed:
+                print(f"🚀 Form submitted! ({timings['submit_confirmation']} ms)")
+            else:
+                print("⚠️ Submitted, but no confirmation page appeared")
         except:
             print("❌ Could not submit the form")
 
-        browser.close()
-        return filled
+        return filled, scanned
+
+    filled, scanned = get_pool().run(_fill, timeout=timeout)
+    if scanned is not None and scanned[0]:
+        try:
+            cache.put(url, *scanned)
+        except Exception as e:
+            # The form is already submitted; a cache failure must not look like a fill failure.
+            print(f"⚠️ Could not cache schema for {url}: {e}")
+    return filled
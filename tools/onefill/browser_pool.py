@@ -0,0 +1,219 @@
+# tools/onefill/browser_pool.py
+"""
+Process-wide Chromium pool shared by the OneFill scanner and filler.
+
+Playwright's sync API is bound to the thread that started it, so every slot
+owns a worker thread with its own browser. Callers hand in a function that
+receives a fresh page; the slot runs it inside a browser context that is
+reused for `max_uses` jobs and then recycled.
+
+Playwright objects cannot be touched from other threads, so a job whose
+caller has timed out is stopped cooperatively: `run` flags it and the job
+calls `raise_if_cancelled()` before any irreversible step (e.g. Submit).
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from ..startup import ensure_chromium
+
+POOL_SIZE = int(os.environ.get("ONEFILL_POOL_SIZE", "2"))
+CONTEXT_MAX_USES = int(os.environ.get("ONEFILL_CONTEXT_MAX_USES", "20"))
+LAUNCH_ARGS = ["--no-sandbox"]
+
+_STOP = object()
+_local = threading.local()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class _Job:
+    __slots__ = ("fn", "future", "started", "cancelled")
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.future = Future()
+        self.started = threading.Event()
+        self.cancelled = threading.Event()
+
+
+def raise_if_cancelled():
+    """Raise JobCancelled inside a pool job whose caller has given up on it."""
+    job = getattr(_local, "job", None)
+    if job is not None and job.cancelled.is_set():
+        raise JobCancelled("Browser job was cancelled after its timeout")
+
+
+class _Slot(threading.Thread):
+    def __init__(self, pool, index):
+        super().__init__(name=f"onefill-browser-{index}", daemon=True)
+        self.pool = pool
+        self.index = index
+        self.browser = None
+        self.context = None
+        self.context_uses = 0
+        self.jobs_served = 0
+        self.recycled = 0
+        self.last_error = None
+
+    def _ensure_context(self, playwright):
+        if self.browser is None or not self.browser.is_connected():
+            if self.browser is not None:
+                print(f"♻️ Browser slot {self.index} disconnected, relaunching")
+            if not ensure_chromium(playwright):
+                raise RuntimeError("Playwright Chromium is not installed; run `flask --app app warmup`")
+            self.browser = playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            self.context = None
+        if self.context is not None and self.context_uses >= self.pool.max_uses:
+            self._close_context()
+            self.recycled += 1
+        if self.context is None:
+            self.context = self.browser.new_context()
+            self.context_uses = 0
+        return self.context
+
+    def _close_context(self):
+        try:
+            self.context.close()
+        except Exception:
+            pass
+        self.context = None
+
+    def run(self):
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            while True:
+                job = self.pool._jobs.get()
+                if job is _STOP:
+                    break
+                if job.cancelled.is_set() or not job.future.set_running_or_notify_cancel():
+                    continue
+                job.started.set()
+                _local.job = job
+                page = None
+                try:
+                    context = self._ensure_context(p)
+                    self.context_uses += 1
+                    page = context.new_page()
+                    job.future.set_result(job.fn(page))
+                except BaseException as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    job.future.set_exception(e)
+                finally:
+                    _local.job = None
+                    self.jobs_served += 1
+                    if page is not None:
+                        try:
+                            page.close()
+                            self.context.clear_cookies()
+                        except Exception:
+                            self._close_context()
+
+            if self.context is not None:
+                self._close_context()
+            if self.browser is not None:
+                try:
+                    self.browser.close()
+                except Exception:
+                    pass
+
+
+class BrowserPool:
+    def __init__(self, size=POOL_SIZE, max_uses=CONTEXT_MAX_USES):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.started_at = time.time()
+        self._jobs = queue.Queue()
+        self._slots = [_Slot(self, i) for i in range(self.size)]
+        self._closed = False
+        for slot in self._slots:
+            slot.start()
+
+    def _enqueue(self, fn):
+        if self._closed:
+            raise RuntimeError("Browser pool is shut down")
+        job = _Job(fn)
+        self._jobs.put(job)
+        return job
+
+    def submit(self, fn):
+        """Queue `fn(page)` on the next free browser slot and return a Future."""
+        return self._enqueue(fn).future
+
+    def run(self, fn, timeout=None):
+        """
+        Run `fn(page)` and return its result. `timeout` counts from when a
+        slot picks the job up; waiting for a slot is bounded by the same
+        amount. On expiry a queued job is withdrawn and a running one is
+        flagged for `raise_if_cancelled`, then TimeoutError is raised.
+        """
+        job = self._enqueue(fn)
+        if timeout is None:
+            return job.future.result()
+        if not job.started.wait(timeout):
+            if job.future.cancel():
+                raise FutureTimeout(f"No browser slot became free within {timeout}s")
+            job.started.wait()  # picked up just as we gave up
+        try:
+            return job.future.result(timeout=timeout)
+        except FutureTimeout:
+            job.cancelled.set()
+            raise
+
+    def health(self):
+        slots = [{
+            "slot": s.index,
+            "alive": s.is_alive(),
+            "browser_connected": bool(s.browser and s.browser.is_connected()),
+            "context_uses": s.context_uses,
+            "jobs_served": s.jobs_served,
+            "contexts_recycled": s.recycled,
+            "last_error": s.last_error,
+        } for s in self._slots]
+        return {
+            "healthy": not self._closed and all(s["alive"] for s in slots),
+            "size": self.size,
+            "max_uses": self.max_uses,
+            "queued": self._jobs.qsize(),
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "slots": slots,
+        }
+
+    def shutdown(self, timeout=10):
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._slots:
+            self._jobs.put(_STOP)
+        for slot in self._slots:
+            slot.join(timeout=timeout)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(shutdown_pool)
@@ -1,31 +1,44 @@
-from playwright.sync_api import sync_playwright
-import re
+from .browser_pool import get_pool
+from .readiness import wait_for_form
+from .form_schema import extract_form_schema, clean_label
+from .schema_cache import get_cache, fingerprint
 
-def extract_fields_from_form(url):
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
-        page = browser.new_page()
+
+def load_form_schema(url, timeout=None):
+    """Return the cached schema for `url`, scanning the live form only on a miss."""
+    cache = get_cache()
+    schema = cache.get(url)
+    if schema is not None:
+        print(f"⚡ Schema cache hit: {url}")
+        return schema
+
+    def _scan(page):
+        if timeout:
+            page.set_default_timeout(timeout * 1000)
         print(f"🌐 Navigating to {url}")
-        page.goto(url, timeout=10000)
-        page.wait_for_timeout(2000)  # Wait for full form load
-
-        labels = set()
-        blocks = page.locator('div[role="listitem"]')
-
-        for i in range(blocks.count()):
-            try:
-                block = blocks.nth(i)
-                label_els = block.locator('div[role="heading"], .M7eMe')
-
-                if label_els.count() > 0:
-                    raw_label = label_els.nth(0).inner_text().strip()
-                    clean_label = re.sub(r"[*:\n]+", "", raw_label).strip().lower()
-                    if clean_label:
-                        labels.add(clean_label)
-            except Exception as e:
-                print(f"⚠️ Skipped block {i}: {e}")
-                continue
-
-        browser.close()
-        print(f"✅ Extracted labels: {labels}")
-        return labels
+        response = page.goto(url, timeout=10000)
+        ready, timings = wait_for_form(page)
+        print(f"⏱️ Form ready: {timings}" if ready else f"⚠️ Form blocks never appeared: {timings}")
+
+        schema = extract_form_schema(page)
+        html = response.text() if response else ""
+        etag = response.headers.get("etag") if response else None
+        return ready, schema, fingerprint(html), etag
+
+    ready, schema, content_hash, etag = get_pool().run(_scan, timeout=timeout)
+    # A page that never showed its questions is not the form's schema; caching
+    # its empty result would serve "no fields" for the whole TTL.
+    if ready and schema:
+        cache.put(url, schema, content_hash, etag)
+    return schema
+
+
+def extract_fields_from_form(url, timeout=None):
+    labels = set()
+    for field in load_form_schema(url, timeout=timeout):
+        clean = clean_label(field["label"]).lower()
+        if clean:
+            labels.add(clean)
+
+    print(f"✅ Extracted labels: {labels}")
+    return labels
@@ -0,0 +1,63 @@
+# tools/onefill/form_schema.py
+"""
+Pulls the whole question schema of a Google Form out of the page in a single
+`page.evaluate` call instead of one locator round trip per block.
+"""
+
+import re
+
+FIELD_SCHEMA_JS = """
+() => {
+  const textInputs = Array.from(document.querySelectorAll('input[type="text"]'));
+  const textAreas = Array.from(document.querySelectorAll('textarea'));
+  const optionValue = el => el.getAttribute('data-value') || el.getAttribute('aria-label') || el.innerText.trim();
+
+  return Array.from(document.querySelectorAll('div[role="listitem"]')).map((block, index) => {
+    const heading = block.querySelector('div[role="heading"], .M7eMe');
+    const label = heading ? heading.innerText.trim() : "";
+    const text = block.querySelector('input[type="text"]');
+    const area = block.querySelector('textarea');
+    const radios = Array.from(block.querySelectorAll('[role="radio"]'));
+    const checks = Array.from(block.querySelectorAll('[role="checkbox"]'));
+    const listbox = block.querySelector('[role="listbox"]');
+
+    let type = "other", options = [], input = null;
+    if (text) {
+      type = "text";
+      input = {selector: 'input[type="text"]', index: textInputs.indexOf(text)};
+    } else if (area) {
+      type = "textarea";
+      input = {selector: 'textarea', index: textAreas.indexOf(area)};
+    } else if (radios.length) {
+      type = "radio";
+      options = radios.map(optionValue);
+    } else if (checks.length) {
+      type = "checkbox";
+      options = checks.map(optionValue);
+    } else if (listbox) {
+      type = "dropdown";
+      options = Array.from(listbox.querySelectorAll('[role="option"]')).map(optionValue).filter(Boolean);
+    } else if (block.querySelector('input[type="date"]')) {
+      type = "date";
+    }
+
+    const required = !!block.querySelector('[aria-required="true"]') || /\\*\\s*$/.test(label);
+    return {index, label, type, required, options, input};
+  });
+}
+"""
+
+FILLABLE_TYPES = {"text", "textarea"}
+
+
+def extract_form_schema(page):
+    """
+    Returns one dict per question block:
+    {"index", "label", "type", "required", "options", "input"}, where `input`
+    is {"selector", "index"} for fillable fields and None otherwise.
+    """
+    return page.evaluate(FIELD_SCHEMA_JS)
+
+
+def clean_label(raw_label):
+    return re.sub(r"[*:\n]+", "", raw_label or "").strip()
@@ -0,0 +1,166 @@
+# tools/onefill/jobs.py
+"""
+In-process job queue for OneFill submissions.
+
+`/onefill/fill` enqueues a job and returns immediately; job workers fan the
+URLs out over the queue's own per-URL pool (separate from the runner's, so a
+long fill job never queues ahead of `/onefill/scan`), retry failures, and
+record per-URL status and timing that the status endpoint and SSE stream
+read back.
+Only failures raised before the Submit click are retried: a timed-out
+attempt may still be on its browser slot, and a form cannot be unsent.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from . import runner
+from .browser_pool import JobCancelled
+
+JOB_WORKERS = int(os.environ.get("ONEFILL_JOB_WORKERS", "2"))
+FILL_RETRIES = int(os.environ.get("ONEFILL_FILL_RETRIES", "1"))
+JOB_HISTORY = int(os.environ.get("ONEFILL_JOB_HISTORY", "200"))
+
+
+class FillJob:
+    def __init__(self, urls, user_data):
+        self.id = uuid.uuid4().hex
+        self.user_data = user_data
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.items = [{
+            "url": url,
+            "status": "pending",
+            "fields_filled": 0,
+            "attempts": 0,
+            "elapsed": None,
+            "error": None,
+        } for url in urls]
+        self.version = 0
+        self._changed = threading.Condition()
+
+    def touch(self, **updates):
+        with self._changed:
+            for key, value in updates.items():
+                setattr(self, key, value)
+            self.version += 1
+            self._changed.notify_all()
+
+    def update_item(self, index, **updates):
+        with self._changed:
+            self.items[index].update(updates)
+            self.version += 1
+            self._changed.notify_all()
+
+    def wait_for_change(self, seen_version, timeout=15):
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != seen_version, timeout=timeout)
+            return self.version
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def snapshot(self):
+        with self._changed:
+            items = [dict(item) for item in self.items]
+            completed = sum(item["status"] in ("done", "failed") for item in items)
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "version": self.version,
+                "total": len(items),
+                "completed": completed,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "items": items,
+            }
+
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, retries=FILL_RETRIES, history=JOB_HISTORY):
+        self.retries = max(0, retries)
+        self.history = history
+        self.on_result = None  # callback(url, fields_filled, success) per finished URL
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="onefill-job")
+        self._fills = ThreadPoolExecutor(max_workers=max(1, runner.MAX_CONCURRENCY), thread_name_prefix="onefill-fill")
+
+    def enqueue(self, urls, user_data):
+        job = FillJob(urls, user_data)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                oldest_id, oldest = next(iter(self._jobs.items()))
+                if not oldest.finished:
+                    break
+                del self._jobs[oldest_id]
+        self._workers.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _fill_one(self, job, index, matcher):
+        from .autofiller import fill_google_form
+
+        url = job.items[index]["url"]
+        for attempt in range(1, self.retries + 2):
+            job.update_item(index, status="running", attempts=attempt)
+            start = time.perf_counter()
+            try:
+                filled = fill_google_form(url, job.user_data, timeout=runner.URL_TIMEOUT, matcher=matcher)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                print(f"❌ {url} (attempt {attempt}): {error}")
+                job.update_item(index, error=error, elapsed=round(time.perf_counter() - start, 3))
+                # Any other error came back from a finished browser job that
+                # never reached Submit, so retrying it is safe.
+                if isinstance(e, (FutureTimeout, JobCancelled)):
+                    job.update_item(index, status="failed")
+                    break
+                continue
+            job.update_item(index, status="done", fields_filled=filled, error=None,
+                            elapsed=round(time.perf_counter() - start, 3))
+            break
+        else:
+            job.update_item(index, status="failed")
+
+        item = job.items[index]
+        if self.on_result:
+            self.on_result(url, item["fields_filled"], item["status"] == "done" and item["fields_filled"] > 0)
+
+    def _run(self, job):
+        from .matcher import FieldMatcher
+
+        job.touch(status="running", started_at=time.time())
+        matcher = FieldMatcher(job.user_data)
+        futures = [self._fills.submit(self._fill_one, job, i, matcher) for i in range(len(job.items))]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ Job {job.id} task crashed: {e}")
+        all_failed = job.items and all(item["status"] == "failed" for item in job.items)
+        job.touch(status="failed" if all_failed else "done", finished_at=time.time())
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,114 @@
+# tools/onefill/matcher.py
+"""
+Batched label matching for OneFill.
+
+Keys are normalized and token-sorted once. token_sort_ratio is just ratio()
+on token-sorted strings, so a whole label × key score matrix then comes from
+a single rapidfuzz `cdist` call. Labels are processed and scores rounded the
+way fuzzywuzzy does (including its force_ascii folding, which drops U+0080 to
+U+00FF, so "Téléphone" compares as "tlphone"), so the 60 (fill) and 80
+(dedup) thresholds behave as before.
+
+`FieldMatcher.assign` adds a one-to-one mode so that "Name" and
+"Father's Name" cannot both claim the same profile key.
+"""
+
+import os
+import re
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+FILL_THRESHOLD = 60
+DEDUP_THRESHOLD = 80
+MATCH_MODE = os.environ.get("ONEFILL_MATCH_MODE", "one_to_one")  # or "best" for per-label greedy
+
+
+_LATIN1 = dict.fromkeys(range(128, 256))
+_NON_WORD = re.compile(r"\W", re.UNICODE)
+
+
+def full_process(text):
+    """fuzzywuzzy's full_process(text, force_ascii=True)."""
+    return _NON_WORD.sub(" ", (text or "").translate(_LATIN1)).lower().strip()
+
+
+def token_key(text):
+    return " ".join(sorted(full_process(text).split()))
+
+
+def score_matrix(queries, choices):
+    """Integer token_sort_ratio for every (query, choice) pair, as a NumPy matrix."""
+    if not queries or not choices:
+        return np.zeros((len(queries), len(choices)), dtype=np.int32)
+    scores = process.cdist(queries, choices, scorer=fuzz.ratio, dtype=np.float32, workers=-1)
+    return np.rint(scores).astype(np.int32)
+
+
+class FieldMatcher:
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self._index = [token_key(k) for k in self.keys]
+
+    def scores(self, labels):
+        return score_matrix([token_key(l) for l in labels], self._index)
+
+    def best_matches(self, labels, threshold=FILL_THRESHOLD):
+        """Return (key or None, score) for each label, in label order."""
+        matrix = self.scores(labels)
+        if not self.keys:
+            return [(None, 0)] * len(labels)
+        best = matrix.argmax(axis=1)
+        matches = []
+        for row, col in enumerate(best):
+            score = int(matrix[row, col])
+            matches.append((self.keys[col], score) if score >= threshold else (None, score))
+        return matches
+
+    def assign(self, labels, threshold=FILL_THRESHOLD):
+        """
+        One-to-one assignment of labels to keys: pairs are taken in descending
+        score order (ties by label, then key order) and each key is used at
+        most once. Returns (key or None, confidence 0-1) per label.
+        """
+        matrix = self.scores(labels)
+        result = [(None, 0.0)] * len(labels)
+        if matrix.size == 0:
+            return result
+
+        order = np.argsort(-matrix, axis=None, kind="stable")
+        rows, cols = np.unravel_index(order, matrix.shape)
+        used_rows, used_cols = set(), set()
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            score = int(matrix[row, col])
+            if score < threshold:
+                break
+            if row in used_rows or col in used_cols:
+                continue
+            used_rows.add(row)
+            used_cols.add(col)
+            result[row] = (self.keys[col], score / 100)
+            if len(used_rows) == len(labels) or len(used_cols) == len(self.keys):
+                break
+        return result
+
+
+def dedupe_fields(fields, threshold=DEDUP_THRESHOLD):
+    """
+    Fuzzy-deduplicate `fields` in the given order: a field joins the first
+    kept entry it scores >= threshold against, and the shorter spelling wins.
+    """
+    fields = list(fields)
+    keys = [token_key(f) for f in fields]
+    matrix = score_matrix(keys, keys)
+
+    kept = []  # indexes into `fields` currently held by each output slot
+    for i, field in enumerate(fields):
+        hits = np.flatnonzero(matrix[i, kept] >= threshold) if kept else ()
+        if len(hits):
+            slot = hits[0]
+            if len(field) < len(fields[kept[slot]]):
+                kept[slot] = i
+        else:
+            kept.append(i)
+    return [fields[j] for j in kept]
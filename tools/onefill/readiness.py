@@ -0,0 +1,93 @@
+# tools/onefill/readiness.py
+"""
+Event-driven readiness checks for Google Form pages.
+
+Each wait returns as soon as its signal fires (or the upper bound is hit)
+and records how long it actually took, so slow forms are visible and fast
+forms are not padded with fixed sleeps.
+"""
+
+import os
+import re
+import threading
+import time
+
+READY_TIMEOUT_MS = int(os.environ.get("ONEFILL_READY_TIMEOUT_MS", "10000"))
+NETWORK_IDLE_TIMEOUT_MS = int(os.environ.get("ONEFILL_NETWORK_IDLE_TIMEOUT_MS", "3000"))
+
+FORM_BLOCK_SELECTOR = 'div[role="listitem"]'
+CONFIRMATION_URL = re.compile(r"/formResponse")
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name, elapsed, ok):
+    with _stats_lock:
+        s = _stats.setdefault(name, {"count": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0})
+        s["count"] += 1
+        s["timeouts"] += 0 if ok else 1
+        s["total_ms"] += elapsed
+        s["max_ms"] = max(s["max_ms"], elapsed)
+
+
+def _timed_wait(name, wait, timings):
+    start = time.perf_counter()
+    ok = True
+    try:
+        wait()
+    except Exception:
+        ok = False
+    elapsed = round((time.perf_counter() - start) * 1000, 1)
+    timings[name] = elapsed
+    _record(name, elapsed, ok)
+    return ok
+
+
+def wait_for_form(page, timeout_ms=None):
+    """
+    Wait until the question blocks are attached, then give the page a short,
+    bounded chance to reach network idle. Returns (ready, timings); `ready` is
+    False when the blocks never attached (slow load, sign-in redirect, closed
+    form), in which case nothing scraped from the page should be trusted.
+    """
+    timeout_ms = timeout_ms or READY_TIMEOUT_MS
+    timings = {}
+
+    ready = _timed_wait(
+        "form_blocks",
+        lambda: page.locator(FORM_BLOCK_SELECTOR).first.wait_for(state="attached", timeout=timeout_ms),
+        timings,
+    )
+    # Late XHRs should not hold a ready form hostage, so cap this one separately.
+    _timed_wait(
+        "network_idle",
+        lambda: page.wait_for_load_state("networkidle", timeout=min(timeout_ms, NETWORK_IDLE_TIMEOUT_MS)),
+        timings,
+    )
+    return ready, timings
+
+
+def wait_for_submission(page, timeout_ms=None):
+    """Wait for the form-response confirmation page. Returns (confirmed, timings)."""
+    timeout_ms = timeout_ms or READY_TIMEOUT_MS
+    timings = {}
+    confirmed = _timed_wait(
+        "submit_confirmation",
+        lambda: page.wait_for_url(CONFIRMATION_URL, timeout=timeout_ms),
+        timings,
+    )
+    return confirmed, timings
+
+
+def readiness_stats():
+    with _stats_lock:
+        return {
+            name: {
+                "count": s["count"],
+                "timeouts": s["timeouts"],
+                "avg_ms": round(s["total_ms"] / s["count"], 1) if s["count"] else 0,
+                "max_ms": s["max_ms"],
+            }
+            for name, s in _stats.items()
+        }
@@ -1,18 +1,18 @@
 # tools/onefill/routes.py
 
-from flask import Blueprint, render_template, request
-from datetime import datetime
-import subprocess
-from fuzzywuzzy import fuzz
+from flask import Blueprint, render_template, request, jsonify, Response
+import json
 from .form_parser import extract_fields_from_form
-from .autofiller import fill_google_form
-
-# Ensure Playwright Chromium is ready
-subprocess.run(["playwright", "install", "chromium"], check=False)
+from .jobs import get_queue
+from .submission_log import get_submission_log
+from .browser_pool import get_pool
+from .runner import run_per_url
+from .readiness import readiness_stats
+from .schema_cache import get_cache
 
 onefill_bp = Blueprint('onefill', __name__, template_folder='templates', static_folder='static')
 
-submission_logs = []  # global list to track submission history
+get_queue().on_result = lambda url, fields_filled, success: get_submission_log().append(url, fields_filled, success)
 
 
 @onefill_bp.route("/")
@@ -22,26 +22,45 @@ def index():
 
 @onefill_bp.route("/dashboard")
 def dashboard():
+    log = get_submission_log()
+    page = request.args.get("page", 1, type=int)
+    rows, has_next = log.page(page)
     return render_template(
         "onefill_dashboard.html",
-        total_forms=len(submission_logs),
-        total_fields=sum(log["fields_filled"] for log in submission_logs),
-        success_rate=round(100 * sum(log["success"] for log in submission_logs) / len(submission_logs)) if submission_logs else 0,
-        submission_logs=submission_logs
+        **log.totals(),
+        submission_logs=rows,
+        automation_logs=[
+            {"task": r["url"], "fields": r["fields_filled"], "success": r["success"], "timestamp": r["timestamp"]}
+            for r in rows
+        ],
+        page=page,
+        has_next=has_next
     )
 
 
+@onefill_bp.route("/logs")
+def logs():
+    page = request.args.get("page", 1, type=int)
+    rows, has_next = get_submission_log().page(page, url=request.args.get("url"))
+    return jsonify({"page": page, "has_next": has_next, "logs": rows})
+
+
+@onefill_bp.route("/health")
+def health():
+    status = get_pool().health()
+    status["readiness"] = readiness_stats()
+    status["schema_cache"] = get_cache().stats()
+    return jsonify(status), (200 if status["healthy"] else 503)
+
+
 @onefill_bp.route("/scan", methods=["POST"])
 def scan():
     urls = [url.strip() for url in request.form["form_urls"].splitlines() if url.strip()]
     raw_fields = set()
 
-    for url in urls:
-        try:
-            fields = extract_fields_from_form(url)
-            raw_fields.update(fields)
-        except Exception as e:
-            print(f"❌ Failed to extract from {url}: {e}")
+    for outcome in run_per_url(extract_fields_from_form, urls):
+        if outcome["ok"]:
+            raw_fields.update(outcome["value"])
 
     normalization_map = {
         "full name": "name",
@@ -60,20 +79,9 @@ def scan():
         key = field.lower().strip()
         normalized_fields.add(normalization_map.get(key, field.strip()))
 
-    # Fuzzy deduplication
-    final_fields = []
-    threshold = 80
-    for new_field in sorted(normalized_fields):
-        matched = False
-        for i, existing in enumerate(final_fields):
-            score = fuzz.token_sort_ratio(new_field.lower(), existing.lower())
-            if score >= threshold:
-                if len(new_field) < len(existing):
-                    final_fields[i] = new_field
-                matched = True
-                break
-        if not matched:
-            final_fields.append(new_field)
+    # Fuzzy deduplication (rapidfuzz/numpy load on first scan, not at import)
+    from .matcher import dedupe_fields, DEDUP_THRESHOLD
+    final_fields = dedupe_fields(sorted(normalized_fields), threshold=DEDUP_THRESHOLD)
 
     return render_template("onefill_unified_form.html", fields=sorted(final_fields), urls=urls)
 
@@ -82,20 +90,39 @@ def scan():
 def fill():
     user_data = {k: v for k, v in request.form.items() if k != "urls"}
     urls = request.form.getlist("urls")
-    results = []
-
-    for url in urls:
-        fields_filled = fill_google_form(url, user_data)
-        success = fields_filled > 0
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-        submission_logs.append({
-            "url": url,
-            "fields_filled": fields_filled,
-            "success": success,
-            "timestamp": timestamp
-        })
-
-        results.append((url, fields_filled))
 
-    return render_template("onefill_success.html", results=results)
+    job = get_queue().enqueue(urls, user_data)
+    if request.accept_mimetypes.best == "application/json":
+        return jsonify({"job_id": job.id, "status_url": f"/onefill/jobs/{job.id}"}), 202
+
+    results = [(url, None) for url in urls]
+    return render_template("onefill_success.html", results=results, job_id=job.id)
+
+
+@onefill_bp.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = get_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(job.snapshot())
+
+
+@onefill_bp.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    job = get_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+
+    def stream():
+        version = None
+        while True:
+            snapshot = job.snapshot()
+            if snapshot["version"] != version:
+                version = snapshot["version"]
+                yield f"data: {json.dumps(snapshot)}\n\n"
+            if job.finished:
+                yield "event: done\ndata: {}\n\n"
+                return
+            job.wait_for_change(version)
+
+    return Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
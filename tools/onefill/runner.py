@@ -0,0 +1,52 @@
+# tools/onefill/runner.py
+"""
+Runs one OneFill task per form URL concurrently and gathers the outcomes
+in input order, so a failing or slow form never takes the others down.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from .browser_pool import POOL_SIZE
+
+MAX_CONCURRENCY = int(os.environ.get("ONEFILL_CONCURRENCY", str(POOL_SIZE)))
+URL_TIMEOUT = float(os.environ.get("ONEFILL_URL_TIMEOUT", "60"))
+
+_executor = ThreadPoolExecutor(max_workers=max(1, MAX_CONCURRENCY), thread_name_prefix="onefill-url")
+
+
+def _timed(fn, url, timeout):
+    start = time.perf_counter()
+    value = fn(url, timeout=timeout)
+    return value, time.perf_counter() - start
+
+
+def run_per_url(fn, urls, timeout=URL_TIMEOUT):
+    """
+    Call `fn(url, timeout=...)` for every URL, at most MAX_CONCURRENCY at a time.
+    Returns one dict per URL, in the same order as `urls`:
+    {"url", "ok", "value", "error", "elapsed"}.
+    """
+    futures = [_executor.submit(_timed, fn, url, timeout) for url in urls]
+    outcomes = []
+
+    for url, future in zip(urls, futures):
+        outcome = {"url": url, "ok": False, "value": None, "error": None, "elapsed": None}
+        try:
+            # fn's browser job bounds its own queueing and run time (and is
+            # cancelled inside the pool on expiry); this wait only guards
+            # against a worker stuck outside the pool.
+            value, elapsed = future.result(timeout=timeout * 3)
+            outcome.update(ok=True, value=value, elapsed=round(elapsed, 3))
+        except FutureTimeout:
+            # Only a call still waiting for a runner thread can be withdrawn.
+            future.cancel()
+            outcome["error"] = f"Timed out after {timeout}s"
+        except Exception as e:
+            outcome["error"] = f"{type(e).__name__}: {e}"
+        if outcome["error"]:
+            print(f"❌ {url}: {outcome['error']}")
+        outcomes.append(outcome)
+
+    return outcomes
@@ -0,0 +1,164 @@
+# tools/onefill/schema_cache.py
+"""
+On-disk cache of extracted form schemas, keyed by normalized form URL.
+
+Fresh entries are served straight from SQLite. Entries past their TTL are
+revalidated with one plain HTTP request (ETag, then a hash of the form's
+question data) before a browser is ever started. The least recently used
+rows are evicted once the cache grows past its size limit.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit, urlunsplit
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DB = os.environ.get("ONEFILL_CACHE_DB", os.path.join(BASE_DIR, "form_schema_cache.sqlite3"))
+CACHE_TTL = int(os.environ.get("ONEFILL_CACHE_TTL", str(24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.environ.get("ONEFILL_CACHE_MAX_ENTRIES", "500"))
+REVALIDATE_TIMEOUT = float(os.environ.get("ONEFILL_REVALIDATE_TIMEOUT", "5"))
+
+# Google Forms embeds the question definitions in this script variable; the
+# rest of the page carries per-request tokens that would defeat a plain hash.
+_LOAD_DATA = re.compile(r"FB_PUBLIC_LOAD_DATA_\s*=\s*(.*?);\s*</script>", re.S)
+_FORM_PATH = re.compile(r"/(viewform|formResponse)/?$")
+
+
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    path = _FORM_PATH.sub("", parts.path).rstrip("/")
+    if "/forms/" in path:
+        path += "/viewform"
+        query = ""
+    else:
+        query = parts.query
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, query, ""))
+
+
+def fingerprint(html):
+    m = _LOAD_DATA.search(html or "")
+    body = m.group(1) if m else (html or "")
+    return hashlib.blake2b(body.encode("utf-8", "ignore"), digest_size=16).hexdigest()
+
+
+class SchemaCache:
+    def __init__(self, path=CACHE_DB, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "stale": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS form_schemas (
+                url TEXT PRIMARY KEY,
+                schema_json TEXT NOT NULL,
+                content_hash TEXT,
+                etag TEXT,
+                fetched_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_form_schemas_last_used ON form_schemas(last_used)")
+        self._conn.commit()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def get(self, url):
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT schema_json, content_hash, etag, fetched_at FROM form_schemas WHERE url = ?", (key,)
+            ).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        schema_json, content_hash, etag, fetched_at = row
+        if schema_json == "[]":
+            # Left behind by a scan of a page that never loaded; rescan it.
+            self._count("misses")
+            self.delete(url)
+            return None
+        now = time.time()
+        if now - fetched_at > self.ttl:
+            if not self._revalidate(url, content_hash, etag):
+                self._count("stale")
+                self._count("misses")
+                self.delete(url)
+                return None
+            self._count("revalidated")
+            fetched_at = now
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE form_schemas SET fetched_at = ?, last_used = ? WHERE url = ?", (fetched_at, now, key)
+            )
+            self._conn.commit()
+            self.counters["hits"] += 1
+        return json.loads(schema_json)
+
+    def put(self, url, schema, content_hash=None, etag=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO form_schemas (url, schema_json, content_hash, etag, fetched_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), json.dumps(schema), content_hash, etag, now, now),
+            )
+            evicted = self._conn.execute(
+                "DELETE FROM form_schemas WHERE url IN ("
+                "SELECT url FROM form_schemas ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            self._conn.commit()
+            self.counters["evictions"] += max(evicted, 0)
+
+    def delete(self, url):
+        with self._lock:
+            self._conn.execute("DELETE FROM form_schemas WHERE url = ?", (normalize_url(url),))
+            self._conn.commit()
+
+    def _revalidate(self, url, content_hash, etag):
+        headers = {"User-Agent": "Mozilla/5.0 (OmniAI OneFill)"}
+        if etag:
+            headers["If-None-Match"] = etag
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=REVALIDATE_TIMEOUT) as resp:
+                html = resp.read().decode("utf-8", "ignore")
+        except urllib.error.HTTPError as e:
+            return e.code == 304
+        except Exception as e:
+            print(f"⚠️ Could not revalidate {url}: {e}")
+            return False
+        return bool(content_hash) and fingerprint(html) == content_hash
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM form_schemas").fetchone()[0]
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters.update(entries=entries, hit_rate=round(counters["hits"] / lookups, 3) if lookups else 0)
+        return counters
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SchemaCache()
+        return _cache
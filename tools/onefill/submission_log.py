@@ -0,0 +1,99 @@
+# tools/onefill/submission_log.py
+"""
+Append-only OneFill submission log backed by SQLite.
+
+Every insert also bumps a single aggregate row in the same transaction, so
+dashboard totals are one primary-key read no matter how long the log gets,
+and every gunicorn worker sees the same history.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DB = os.environ.get("ONEFILL_LOG_DB", os.path.join(BASE_DIR, "submission_log.sqlite3"))
+PAGE_SIZE = 25
+
+
+class SubmissionLog:
+    def __init__(self, path=LOG_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS submissions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                fields_filled INTEGER NOT NULL,
+                success INTEGER NOT NULL,
+                timestamp TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_submissions_timestamp ON submissions(timestamp);
+            CREATE INDEX IF NOT EXISTS idx_submissions_url ON submissions(url);
+
+            CREATE TABLE IF NOT EXISTS submission_totals (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_forms INTEGER NOT NULL,
+                total_fields INTEGER NOT NULL,
+                total_success INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO submission_totals VALUES (1, 0, 0, 0);
+        """)
+        self._conn.commit()
+
+    def append(self, url, fields_filled, success):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO submissions (url, fields_filled, success, timestamp) VALUES (?, ?, ?, ?)",
+                (url, fields_filled, int(bool(success)), timestamp),
+            )
+            self._conn.execute(
+                "UPDATE submission_totals SET total_forms = total_forms + 1, "
+                "total_fields = total_fields + ?, total_success = total_success + ? WHERE id = 1",
+                (fields_filled, int(bool(success))),
+            )
+
+    def totals(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT total_forms, total_fields, total_success FROM submission_totals WHERE id = 1"
+            ).fetchone()
+        total_forms = row["total_forms"]
+        return {
+            "total_forms": total_forms,
+            "total_fields": row["total_fields"],
+            "success_rate": round(100 * row["total_success"] / total_forms) if total_forms else 0,
+        }
+
+    def page(self, page=1, page_size=PAGE_SIZE, url=None):
+        """Newest-first slice of the log; returns (rows, has_next)."""
+        page = max(1, page)
+        query = "SELECT url, fields_filled, success, timestamp FROM submissions"
+        params = []
+        if url:
+            query += " WHERE url = ?"
+            params.append(url)
+        query += " ORDER BY id DESC LIMIT ? OFFSET ?"
+        params += [page_size + 1, (page - 1) * page_size]
+        with self._lock:
+            rows = [dict(r) for r in self._conn.execute(query, params).fetchall()]
+        for row in rows:
+            row["success"] = bool(row["success"])
+        return rows[:page_size], len(rows) > page_size
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_submission_log():
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = SubmissionLog()
+        return _log
@@ -0,0 +1,156 @@
+# tools/pdf_extract.py
+"""
+Page-streaming PDF text extraction shared by the ATS portal and the text
+detector.
+
+`iter_pdf_pages` yields text one page at a time and stops once the page or
+byte budget is spent, so a 300-page upload never has to be materialised as
+one string. PyMuPDF is used when it is installed (it is several times faster
+than PyPDF2); any file it cannot open falls back to PyPDF2. Long documents
+are split into page ranges and parsed in a process pool, still yielded in
+page order. Sources may be paths or in-memory/spooled uploads.
+"""
+
+import importlib.util
+import multiprocessing
+import os
+import threading
+from collections import deque
+
+from tools.procpool import process_pool
+from tools.uploads import source_path
+
+PDF_MAX_PAGES = int(os.environ.get("OMNIAI_PDF_MAX_PAGES", "200"))
+PDF_MAX_BYTES = int(os.environ.get("OMNIAI_PDF_MAX_BYTES", str(4 * 1024 * 1024)))
+PDF_WORKERS = int(os.environ.get("OMNIAI_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARALLEL_MIN_PAGES = int(os.environ.get("OMNIAI_PDF_PARALLEL_MIN_PAGES", "24"))
+CHUNK_PAGES = 8
+
+# PyMuPDF is only looked up here; it is imported on the first PDF opened, so
+# importing this module (at app startup) stays cheap.
+BACKEND = "pymupdf" if importlib.util.find_spec("fitz") else "pypdf2"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _worker_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = process_pool(PDF_WORKERS)
+        return _pool
+
+
+# -------------------------
+# Backends
+# -------------------------
+def _open(source, backend):
+    if not isinstance(source, str):
+        source.seek(0)
+    if backend == "pymupdf":
+        import fitz  # PyMuPDF
+        if isinstance(source, str):
+            return fitz.open(source)
+        return fitz.open(stream=source.read(), filetype="pdf")
+    from PyPDF2 import PdfReader
+    return PdfReader(source)
+
+
+def _page_count(doc, backend):
+    return doc.page_count if backend == "pymupdf" else len(doc.pages)
+
+
+def _page_text(doc, backend, i):
+    if backend == "pymupdf":
+        return doc.load_page(i).get_text() or ""
+    return doc.pages[i].extract_text() or ""
+
+
+def _extract_range(path, backend, start, stop):
+    """Worker entry point: text of pages [start, stop) of one file."""
+    doc = _open(path, backend)
+    try:
+        return [_page_text(doc, backend, i) for i in range(start, stop)]
+    finally:
+        if backend == "pymupdf":
+            doc.close()
+
+
+def _resolve_backend(source, backend):
+    """Open `source` with the preferred backend, falling back to PyPDF2."""
+    backend = backend or BACKEND
+    try:
+        return backend, _open(source, backend)
+    except Exception:
+        if backend == "pypdf2":
+            raise
+        return "pypdf2", _open(source, "pypdf2")
+
+
+# -------------------------
+# Public API
+# -------------------------
+def iter_pdf_pages(source, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES, workers=PDF_WORKERS, backend=None):
+    """
+    Yield the text of each page in order, stopping after `max_pages` pages or
+    once `max_bytes` of UTF-8 text have been produced (the last page is cut
+    at the budget).
+    """
+    backend, doc = _resolve_backend(source, backend)
+    total = _page_count(doc, backend)
+    if max_pages:
+        total = min(total, max_pages)
+
+    # Pool workers need a file they can open; small in-memory uploads and
+    # worker processes themselves (e.g. bulk ranking) stay serial.
+    path = source_path(source)
+    parallel = (
+        path is not None and workers > 1 and total >= PARALLEL_MIN_PAGES
+        and multiprocessing.parent_process() is None
+    )
+    if parallel:
+        if backend == "pymupdf":
+            doc.close()
+        pages = _iter_parallel(path, backend, total, workers)
+    else:
+        pages = (_page_text(doc, backend, i) for i in range(total))
+
+    budget = max_bytes or float("inf")
+    try:
+        for text in pages:
+            size = len(text.encode("utf-8"))
+            if size >= budget:
+                yield text.encode("utf-8")[:int(budget)].decode("utf-8", "ignore")
+                return
+            budget -= size
+            yield text
+    finally:
+        pages.close()
+        if backend == "pymupdf" and not parallel:
+            doc.close()
+
+
+def _iter_parallel(path, backend, total, workers):
+    # A bounded window of in-flight ranges keeps memory flat on huge files.
+    pool = _worker_pool()
+    ranges = deque((s, min(s + CHUNK_PAGES, total)) for s in range(0, total, CHUNK_PAGES))
+    pending = deque()
+    try:
+        while ranges or pending:
+            while ranges and len(pending) < workers * 2:
+                start, stop = ranges.popleft()
+                pending.append(pool.submit(_extract_range, path, backend, start, stop))
+            yield from pending.popleft().result()
+    finally:
+        for f in pending:
+            f.cancel()
+
+
+def pdf_cache_kind(max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Extraction-cache key part: output depends on the backend and the budget."""
+    return f"pdf:{BACKEND}:{max_pages}:{max_bytes}"
+
+
+def extract_pdf_text(source, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    return " ".join(iter_pdf_pages(source, max_pages=max_pages, max_bytes=max_bytes))
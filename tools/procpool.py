@@ -0,0 +1,21 @@
+# tools/procpool.py
+"""
+Process pools that are safe to start from the web server.
+
+The server process runs Playwright, Gradio/uvicorn and job threads, and
+forking it can leave a child stuck on a lock another thread held at fork
+time. Pools here start their workers from a forkserver instead (spawn where
+forkserver is unavailable), so children begin from a clean interpreter and
+import only what their task needs.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def process_pool(max_workers):
+    return ProcessPoolExecutor(
+        max_workers=max(1, max_workers), mp_context=multiprocessing.get_context(START_METHOD)
+    )
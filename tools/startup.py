@@ -0,0 +1,148 @@
+# tools/startup.py
+"""
+Startup bookkeeping for OMNI_AI: named phase timings for the cold-start
+report, plus the lazily-checked, cached Playwright Chromium installation.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+AUTO_INSTALL_BROWSER = os.environ.get("OMNIAI_AUTO_INSTALL_BROWSER", "1") == "1"
+
+_process_start = time.time()
+_phases = OrderedDict()
+_phases_lock = threading.Lock()
+
+_chromium_ready = None
+_chromium_lock = threading.Lock()
+
+
+@contextmanager
+def phase(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = round((time.perf_counter() - start) * 1000, 1)
+        with _phases_lock:
+            _phases[name] = elapsed
+
+
+def startup_report():
+    with _phases_lock:
+        phases = dict(_phases)
+    return {
+        "phases_ms": phases,
+        "total_phase_ms": round(sum(phases.values()), 1),
+        "uptime_s": round(time.time() - _process_start, 1),
+        "chromium_ready": _chromium_ready,
+    }
+
+
+def install_chromium():
+    with phase("chromium_install"):
+        result = subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=False)
+    return result.returncode == 0
+
+
+def ensure_chromium(playwright, auto_install=AUTO_INSTALL_BROWSER):
+    """
+    Check once per process that Playwright's Chromium binary exists, installing
+    it on first use if allowed. The answer is cached for every later caller.
+    """
+    global _chromium_ready
+    with _chromium_lock:
+        if _chromium_ready:
+            return True
+        with phase("chromium_check"):
+            _chromium_ready = os.path.exists(playwright.chromium.executable_path)
+        if not _chromium_ready and auto_install:
+            print("📦 Chromium missing, installing it once for this machine...")
+            _chromium_ready = install_chromium() and os.path.exists(playwright.chromium.executable_path)
+        return _chromium_ready
+
+
+# -------------------------
+# Deferred heavy imports
+# -------------------------
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy modules each tool needs at request time, for `flask import-profile`.
+# Only modules that are safe to import anywhere: ats_app (admin bootstrap,
+# DB migration) and blueprints that wire up singletons are left out.
+TOOL_MODULES = {
+    "onefill": ["tools.onefill.form_parser", "tools.onefill.matcher", "tools.onefill.autofiller", "playwright.sync_api"],
+    "text_detector": ["tools.text_detector.batch", "tools.pdf_extract", "PyPDF2", "docx2txt"],
+    "ats_portal": ["tools.ats_portal.analysis", "tools.ats_portal.bulk_rank", "gradio"],
+}
+PRELOAD_MODULES = [
+    m for m in os.environ.get(
+        "OMNIAI_PRELOAD_MODULES",
+        "tools.onefill.matcher,tools.onefill.autofiller,playwright.sync_api,PyPDF2,docx2txt",
+    ).split(",") if m.strip()
+]
+
+_preload_started = False
+_preload_lock = threading.Lock()
+_profile_cache = {}
+
+
+def preload_in_background(modules=None):
+    """Import heavy modules on a daemon thread, once, timing each as `preload:<name>`."""
+    global _preload_started
+    with _preload_lock:
+        if _preload_started:
+            return
+        _preload_started = True
+
+    def _preload():
+        import importlib
+        for name in modules or PRELOAD_MODULES:
+            try:
+                with phase(f"preload:{name.strip()}"):
+                    importlib.import_module(name.strip())
+            except Exception as e:
+                print(f"⚠️ Preload of {name} failed: {e}")
+
+    threading.Thread(target=_preload, name="omniai-preload", daemon=True).start()
+
+
+def import_profile(tool, refresh=False):
+    """
+    Run `python -X importtime` for one tool's modules in a fresh interpreter and
+    aggregate self time per top-level package. Results are cached per tool.
+    """
+    if tool not in TOOL_MODULES:
+        raise KeyError(tool)
+    if tool in _profile_cache and not refresh:
+        return _profile_cache[tool]
+
+    cmd = [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(TOOL_MODULES[tool])]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=ROOT_DIR, timeout=300)
+
+    by_package = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, _, name = line[len("import time:"):].split("|", 2)
+            package = name.strip().split(".")[0]
+            by_package[package] = by_package.get(package, 0) + int(self_us)
+        except ValueError:
+            continue
+
+    top = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:20]
+    report = {
+        "tool": tool,
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode else None,
+        "total_ms": round(sum(by_package.values()) / 1000, 1),
+        "by_package_ms": {pkg: round(us / 1000, 1) for pkg, us in top},
+    }
+    _profile_cache[tool] = report
+    return report
@@ -0,0 +1,65 @@
+# tools/text_detector/bench_batch.py
+"""
+Throughput of per-document `ai_likelihood_score` vs batch `score_texts`
+on the same corpus; asserts the scores are identical.
+
+    python -m tools.text_detector.bench_batch [essays_dir] [--docs 4000]
+"""
+
+import argparse
+import os
+import random
+import time
+
+from tools.text_detector.batch import score_texts
+from tools.text_detector.routes import ai_likelihood_score
+
+
+def synthetic_essays(n, seed=7):
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice("etaoinshrdlucmfw") for _ in range(rng.randint(1, 9))) for _ in range(4000)]
+    vocab += ["café", "naïve", "—", "“quoted”", "it’s", "Straße"]
+    essays = []
+    for _ in range(n):
+        sentences = []
+        for _ in range(rng.randint(5, 40)):
+            words = " ".join(rng.choice(vocab) for _ in range(rng.randint(3, 28)))
+            sentences.append(words.capitalize() + rng.choice([". ", "! ", "? ", ".\n", ", ", "\n\n"]))
+        essays.append("".join(sentences))
+    return essays
+
+
+def load_dir(path):
+    texts = []
+    for name in sorted(os.listdir(path)):
+        if name.endswith(".txt"):
+            with open(os.path.join(path, name), encoding="utf-8", errors="ignore") as f:
+                texts.append(f.read())
+    return texts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("essays_dir", nargs="?")
+    parser.add_argument("--docs", type=int, default=4000)
+    args = parser.parse_args(argv)
+
+    texts = load_dir(args.essays_dir) if args.essays_dir else synthetic_essays(args.docs)
+
+    start = time.perf_counter()
+    single = [ai_likelihood_score(t) for t in texts]
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = score_texts(texts)
+    batch_s = time.perf_counter() - start
+
+    assert single == batch, "batch scores differ from ai_likelihood_score"
+    print(f"documents    : {len(texts)}")
+    print(f"per document : {len(texts) / single_s:9.0f} docs/s")
+    print(f"batch        : {len(texts) / batch_s:9.0f} docs/s")
+    print(f"speedup      : {single_s / batch_s:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
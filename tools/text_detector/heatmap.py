@@ -0,0 +1,99 @@
+# tools/text_detector/heatmap.py
+"""
+Per-sentence AI-likelihood heatmap.
+
+Each sentence is scored on the window of sentences centred on it, using the
+same formula as `ai_likelihood_score`. Sentence-length sums come from prefix
+sums and the word counts of the window are maintained incrementally as it
+slides (each sentence's words are added once and removed once), so the
+whole series costs O(words) instead of re-scoring every window.
+"""
+
+import os
+import re
+from collections import Counter
+from itertools import accumulate
+
+_WORD = re.compile(r"\b\w+\b")
+
+WINDOW = int(os.environ.get("OMNIAI_HEATMAP_WINDOW", "5"))
+
+
+def _likelihood(length_uniformity, diversity, rare_ratio):
+    score = (length_uniformity * 0.4 + (1 - diversity) * 0.4 + (0.3 - rare_ratio) * 1.5)
+    return round(max(0, min(score, 1)) * 100, 2)
+
+
+class _WindowCounts:
+    """Word counts of the current window plus its unique and count==1 totals."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.unique = 0
+        self.singles = 0
+
+    def add(self, words):
+        for w in words:
+            c = self.counts[w]
+            if c == 0:
+                self.unique += 1
+                self.singles += 1
+            elif c == 1:
+                self.singles -= 1
+            self.counts[w] = c + 1
+
+    def remove(self, words):
+        for w in words:
+            c = self.counts[w]
+            if c == 1:
+                self.unique -= 1
+                self.singles -= 1
+                del self.counts[w]
+                continue
+            if c == 2:
+                self.singles += 1
+            self.counts[w] = c - 1
+
+
+def window_scores(sentences, window=WINDOW):
+    """Score for each sentence over the `window` sentences centred on it."""
+    n = len(sentences)
+    if not n:
+        return []
+    half = max(window, 1) // 2
+    lengths = [len(s.split()) for s in sentences]
+    words = [_WORD.findall(s.lower()) for s in sentences]
+    p1 = [0, *accumulate(lengths)]
+    p2 = [0, *accumulate(l * l for l in lengths)]
+    pw = [0, *accumulate(len(w) for w in words)]
+
+    counts = _WindowCounts()
+    lo = hi = 0
+    scores = []
+    for i in range(n):
+        new_lo, new_hi = max(0, i - half), min(n, i + half + 1)
+        while hi < new_hi:
+            counts.add(words[hi])
+            hi += 1
+        while lo < new_lo:
+            counts.remove(words[lo])
+            lo += 1
+
+        m = hi - lo
+        mean = (p1[hi] - p1[lo]) / m
+        var = max((p2[hi] - p2[lo]) / m - mean * mean, 0.0)
+        uniformity = 1 - (var ** 0.5 / mean) if mean else 0
+
+        total = pw[hi] - pw[lo]
+        diversity = counts.unique / total if total else 0
+        rare_ratio = counts.singles / total if total else 0
+        scores.append(_likelihood(uniformity, diversity, rare_ratio))
+    return scores
+
+
+def sentence_heatmap(sentences, window=WINDOW):
+    """[{"index", "text", "score"}] for each sentence, in document order."""
+    return [
+        {"index": i, "text": s, "score": score}
+        for i, (s, score) in enumerate(zip(sentences, window_scores(sentences, window)))
+    ]
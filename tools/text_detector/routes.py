@@ -1,9 +1,14 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, render_template, request, jsonify
 import re
-import docx2txt
-from PyPDF2 import PdfReader
 from collections import Counter
 import os
+import time
+import zipfile
+from tools.extract_cache import cached_extract
+from tools.uploads import open_upload, iter_uploads, UploadTooLarge
+from tools.pdf_extract import extract_pdf_text, pdf_cache_kind
+from tools.text_detector.streaming import score_chunks, iter_text_file
+from tools.text_detector.heatmap import sentence_heatmap, WINDOW
 
 textdetector_bp = Blueprint(
     "textdetector",
@@ -12,18 +17,19 @@ textdetector_bp = Blueprint(
     static_folder="static"
 )
 
-# Extract text from uploaded file
-def extract_text(filepath):
-    if filepath.endswith(".txt"):
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+# Extract text from a path or an in-memory upload (type taken from `filename`)
+def extract_text(source, filename=None):
+    filename = (filename or source).lower()
+    if filename.endswith(".txt"):
+        return "".join(iter_text_file(source))
 
-    elif filepath.endswith(".docx"):
-        return docx2txt.process(filepath)
+    elif filename.endswith(".docx"):
+        import docx2txt
+        return cached_extract(source, docx2txt.process, "docx:docx2txt")
 
-    elif filepath.endswith(".pdf"):
-        reader = PdfReader(filepath)
-        return " ".join(page.extract_text() or "" for page in reader.pages)
+    elif filename.endswith(".pdf"):
+        # Page-streamed, budgeted extraction; PyMuPDF when available.
+        return cached_extract(source, extract_pdf_text, pdf_cache_kind())
 
     else:
         raise ValueError("Unsupported file type! Please upload .txt, .docx, or .pdf.")
@@ -57,45 +63,139 @@ def ai_likelihood_score(text):
     return round(score * 100, 2)
 
 
+# Score an upload; .txt is streamed so memory stays bounded by vocabulary.
+# PDF/DOCX text is already capped by the extraction budget.
+def score_file(source, filename=None):
+    if (filename or source).lower().endswith(".txt"):
+        return score_chunks(iter_text_file(source))
+    return score_chunks([extract_text(source, filename)])
+
+
+# Score category shown to the user
+def score_category(score):
+    if score >= 90:
+        return f"🚨 {score}% Very Likely AI-Generated", "Highly machine-like patterns and uniformity."
+    elif score >= 80:
+        return f"⚠️ {score}% Likely AI-Generated", "Multiple AI traits detected."
+    elif score >= 63:
+        return f"🟠 {score}% Possibly AI-Generated", "Could be AI-assisted or mixed writing."
+    elif score >= 45:
+        return f"🟡 {score}% Somewhat AI-Influenced", "Shows some AI-like flow but still human-like."
+    else:
+        return f"✅ Only {score}% AI-likelihood detected", f"Mostly human-written ({100 - score}% human score)."
+
+
+SUPPORTED = (".txt", ".docx", ".pdf")
+MAX_BATCH_FILES = int(os.environ.get("OMNIAI_DETECT_MAX_BATCH", "5000"))
+
+
+# Batch scoring: many files and/or .zip archives in one request
+@textdetector_bp.route("/batch", methods=["POST"])
+def batch():
+    from tools.text_detector.batch import score_texts
+
+    started = time.perf_counter()
+    names, texts, errors = [], [], {}
+    try:
+        for name, doc in iter_uploads(request.files.getlist("files") + request.files.getlist("file"), SUPPORTED, MAX_BATCH_FILES):
+            try:
+                texts.append(extract_text(doc, name) or "")
+            except Exception as e:
+                texts.append("")
+                errors[len(names)] = str(e)
+            names.append(name)
+    except (ValueError, zipfile.BadZipFile) as e:
+        return jsonify({"error": str(e)}), 413 if isinstance(e, UploadTooLarge) else 400
+    if not names:
+        return jsonify({"error": "Upload .txt, .docx, .pdf files or a .zip of them as 'files'."}), 400
+    extracted = time.perf_counter()
+
+    scores = score_texts(texts)
+    results = []
+    for i, (name, score) in enumerate(zip(names, scores)):
+        row = {"filename": name, "score": score, "label": score_category(score)[0]}
+        if i in errors:
+            row["error"] = errors[i]
+        results.append(row)
+    done = time.perf_counter()
+
+    return jsonify({
+        "count": len(results),
+        "results": results,
+        "timings_ms": {
+            "extract": round((extracted - started) * 1000, 1),
+            "score": round((done - extracted) * 1000, 1),
+        },
+    })
+
+
+HEATMAP_MAX_BYTES = int(os.environ.get("OMNIAI_HEATMAP_MAX_BYTES", str(2 * 1024 * 1024)))
+
+
+# Per-sentence heatmap as JSON, from an uploaded file or a "text" field
+@textdetector_bp.route("/heatmap", methods=["POST"])
+def heatmap_api():
+    window = request.args.get("window", WINDOW, type=int)
+    uploaded = request.files.get("file")
+    if uploaded and uploaded.filename:
+        ext = os.path.splitext(uploaded.filename)[1].lower()
+        if ext not in SUPPORTED:
+            return jsonify({"error": "Unsupported file type! Please upload .txt, .docx, or .pdf."}), 400
+        try:
+            with open_upload(uploaded.stream, uploaded.filename) as doc:
+                text = extract_text(doc, uploaded.filename)
+        except UploadTooLarge as e:
+            return jsonify({"error": str(e)}), 413
+    else:
+        payload = request.get_json(silent=True)
+        if payload is None:
+            payload = {}
+        elif not isinstance(payload, dict):
+            return jsonify({"error": "The JSON body must be an object."}), 400
+        text = payload.get("text") or request.form.get("text", "")
+        if not isinstance(text, str):
+            return jsonify({"error": "'text' must be a string."}), 400
+    if len(text.encode("utf-8")) > HEATMAP_MAX_BYTES:
+        return jsonify({"error": f"Heatmaps are limited to {HEATMAP_MAX_BYTES} bytes of text."}), 413
+
+    sentences = split_sentences(text)
+    return jsonify({
+        "score": ai_likelihood_score(text),
+        "window": window,
+        "sentences": sentence_heatmap(sentences, window),
+    })
+
+
 # Flask Page Route
 @textdetector_bp.route("/", methods=["GET", "POST"])
 def home():
     result = None
     explanation = None
     filename = None
+    heatmap = None
 
     if request.method == "POST":
         uploaded = request.files.get("file")
 
         if uploaded:
             filename = uploaded.filename
-            os.makedirs("uploads", exist_ok=True)
-            filepath = os.path.join("uploads", filename)
-            uploaded.save(filepath)
-
-            text = extract_text(filepath)
-            score = ai_likelihood_score(text)
-
-            # Score category
-            if score >= 90:
-                result = f"🚨 {score}% Very Likely AI-Generated"
-                explanation = "Highly machine-like patterns and uniformity."
-            elif score >= 80:
-                result = f"⚠️ {score}% Likely AI-Generated"
-                explanation = "Multiple AI traits detected."
-            elif score >= 63:
-                result = f"🟠 {score}% Possibly AI-Generated"
-                explanation = "Could be AI-assisted or mixed writing."
-            elif score >= 45:
-                result = f"🟡 {score}% Somewhat AI-Influenced"
-                explanation = "Shows some AI-like flow but still human-like."
-            else:
-                result = f"✅ Only {score}% AI-likelihood detected"
-                explanation = f"Mostly human-written ({100 - score}% human score)."
+            # Parsed from memory (or a private spool for big files); nothing
+            # is written to a shared uploads/ directory.
+            try:
+                with open_upload(uploaded.stream, filename) as doc:
+                    score = score_file(doc, filename)
+                    result, explanation = score_category(score)
+
+                    # The overlay needs the sentences in memory, so only for moderate sizes.
+                    if doc.seek(0, os.SEEK_END) <= HEATMAP_MAX_BYTES:
+                        heatmap = sentence_heatmap(split_sentences(extract_text(doc, filename)))
+            except UploadTooLarge as e:
+                result, explanation = "❌ File too large", str(e)
 
     return render_template(
         "text_detector.html",
         result=result,
         explanation=explanation,
-        filename=filename
+        filename=filename,
+        heatmap=heatmap
     )
@@ -0,0 +1,108 @@
+# tools/uploads.py
+"""
+Upload handling without a shared uploads/ directory.
+
+`open_upload` copies a request file into a seekable buffer: a BytesIO when it
+fits in `SPOOL_MAX_MEMORY`, otherwise a private NamedTemporaryFile that is
+deleted as soon as the request is done. Either way the byte count is checked
+against `MAX_UPLOAD_BYTES` while reading, so an oversized (or decompressing)
+upload is rejected before it is fully buffered. Extractors take the returned
+file object directly; large spools also expose a real path via `.name`.
+`iter_uploads` walks a multi-file request, expanding .zip archives.
+"""
+
+import io
+import os
+import tempfile
+import zipfile
+from contextlib import contextmanager
+
+MAX_REQUEST_BYTES = int(os.environ.get("OMNIAI_MAX_REQUEST_BYTES", str(100 * 1024 * 1024)))
+MAX_UPLOAD_BYTES = int(os.environ.get("OMNIAI_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+SPOOL_MAX_MEMORY = int(os.environ.get("OMNIAI_UPLOAD_SPOOL_BYTES", str(4 * 1024 * 1024)))
+COPY_CHUNK = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def _too_large(name, max_bytes):
+    return UploadTooLarge(f"{name} is larger than the {max_bytes / (1024 * 1024):g} MB upload limit.")
+
+
+def copy_bounded(src, dst, name, max_bytes, size=0):
+    """
+    Copy `src` into `dst` in chunks, counting on from `size` bytes; raises
+    UploadTooLarge once the total passes `max_bytes`. Returns the total.
+    """
+    for chunk in iter(lambda: src.read(COPY_CHUNK), b""):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(name, max_bytes)
+        dst.write(chunk)
+    return size
+
+
+@contextmanager
+def open_upload(stream, filename="", max_bytes=MAX_UPLOAD_BYTES, spool_bytes=SPOOL_MAX_MEMORY):
+    """Yield a seekable binary file holding `stream`'s bytes (see module doc)."""
+    name = os.path.basename(filename or "upload")
+    head = stream.read(min(spool_bytes, max_bytes) + 1)
+    if len(head) > max_bytes:
+        raise _too_large(name, max_bytes)
+
+    if len(head) <= spool_bytes:
+        f = io.BytesIO(head)
+    else:
+        f = tempfile.NamedTemporaryFile(prefix="omniai_upload_", suffix=os.path.splitext(name)[1].lower())
+        try:
+            f.write(head)
+            copy_bounded(stream, f, name, max_bytes, size=len(head))
+            f.flush()
+        except BaseException:
+            f.close()
+            raise
+    f.seek(0)
+    try:
+        yield f
+    finally:
+        f.close()
+
+
+def source_path(source):
+    """Filesystem path behind `source` (a path, or a spooled temp file), else None."""
+    if isinstance(source, str):
+        return source
+    name = getattr(source, "name", None)
+    return name if isinstance(name, str) and os.path.isfile(name) else None
+
+
+
+def iter_uploads(files, supported, max_files):
+    """
+    Yield (display name, seekable file) for each supported upload and each
+    supported member of an uploaded .zip, one at a time and never on disk
+    beyond a private spool.
+    """
+    count = 0
+    for f in files:
+        name = os.path.basename(f.filename or "")
+        if name.lower().endswith(".zip"):
+            with open_upload(f.stream, name, max_bytes=MAX_REQUEST_BYTES) as archive, zipfile.ZipFile(archive) as zf:
+                for member in zf.infolist():
+                    base = os.path.basename(member.filename)
+                    if member.is_dir() or base.startswith(".") or not base.lower().endswith(supported):
+                        continue
+                    count += 1
+                    if count > max_files:
+                        raise ValueError(f"At most {max_files} documents per batch.")
+                    # Bounded read: the member's declared size is not trusted.
+                    with zf.open(member) as src, open_upload(src, base) as doc:
+                        yield member.filename, doc
+        elif name.lower().endswith(supported):
+            count += 1
+            if count > max_files:
+                raise ValueError(f"At most {max_files} documents per batch.")
+            with open_upload(f.stream, name) as doc:
+                yield f.filename, doc